@@ -1,6 +1,9 @@
+import inspect
+import uuid
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from delays.profiling import RerunProfile
 
 
 st.set_page_config(
@@ -18,161 +21,155 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
-@st.cache_data(show_spinner=False)
-def load_data_jordan():
-    return pd.read_csv("csv/delays_reduced.csv")
-
-@st.cache_data(show_spinner=False)
-def load_data_julia():
-    df = pd.read_csv("csv/delays_updated.csv")
-    if "year" in df.columns and "month" in df.columns:
-        df["date"] = pd.to_datetime(
-            df["year"].astype(str) + "-" + df["month"].astype(str) + "-01"
-        )
-    if "delay_rate" not in df.columns:
-        df["delay_rate"] = df.apply(
-            lambda x: x["arr_del15"] / x["arr_flights"] if x["arr_flights"] > 0 else 0,
-            axis=1
-        )
-    return df
-
-@st.cache_data(show_spinner=False)
-def load_data_nessa():
-    df = pd.read_csv("csv/delays_transformed.csv")
-    return df[(df['year'] <= 2019) & (df['year'] >= 2014)]
+TREND_AXES = {
+    "avg_delay_min": {"title": "Delay (min)"},
+    "delay_rate": {"title": "Rate", "tickformat": ".1%"},
+}
+
+
+# Figures are shared read-only; the downsampler caps the points per line sent to the browser.
+@st.cache_resource(show_spinner=False, max_entries=128)
+def load_trend_figure(version, measure, season, carriers, airports):
+    import plotly.express as px
+    by = queries.trend_group(carriers, airports)
+    df_trend = queries.trends(measure, season, carriers, airports, by=by)
+    if df_trend.empty:
+        return None
+    df_trend = downsample(df_trend, "date", measure, by)
+    fig = px.line(df_trend, x="date", y=measure, color=by, markers=True)
+    fig.update_layout(yaxis_title=TREND_AXES[measure]["title"], xaxis_title="", template="plotly_white")
+    fig.update_yaxes(tickformat=TREND_AXES[measure].get("tickformat"))
+    return fig
 
 # Page setup
 st.set_page_config(page_title="Airline Delay Dashboard", layout="wide")
 st.title("🛫 Airline Delay Analysis Dashboard")
 st.markdown("---")
 
-df_jordan = load_data_jordan()
-df_julia = load_data_julia()
-df_nessa = load_data_nessa()
+# pandas, plotly and the query layer are imported after the header, so a fresh worker paints
+# the page while they load; plotly waits for the first chart.
+import pandas as pd
+
+from delays import queries
+from delays.downsample import downsample
+from delays.grid import paged_dataframe
+
+# Cached frames are shared by every session; copy-on-write keeps filtered
+# selections from copying them and any accidental write from leaking into them.
+pd.set_option("mode.copy_on_write", True)
+
+# Every stage of a rerun is timed; add ?debug=1 to the URL for the per-rerun panel. Each tab
+# is a fragment with its own profile, since its widgets rerun only the tab.
+session = st.session_state.setdefault("profile_session", uuid.uuid4().hex[:8])
+profile = RerunProfile("app", session)
 
-tab1, tab2, tab3 = st.tabs(["Delay Trends", "Delay Causes", "Airport Analysis"])
+
+def finish_profile(profile):
+    total = profile.finish()
+    if st.query_params.get("debug") == "1":
+        with st.expander(f"{profile.app} rerun profile: {total * 1e3:.0f} ms", expanded=True):
+            st.dataframe(pd.DataFrame(profile.rows()), width='stretch', hide_index=True)
+
+# The numbers come from the query layer, which rebuilds its engines when the store version changes.
+with profile.span("load") as span:
+    data = queries.dataset()
+    version = data.version
+    trend_cube = data.trend_cube
+    df_jordan = data.airport_view.frame
+    span.rows = len(data.table)
 
 # Tab 1: Delay Trends
-with tab1:
+@st.fragment
+def trends_tab():
+    profile = RerunProfile("app.trends", session)
     st.header("Delay Trends")
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        seasons = ["All"] + sorted(df_julia["season"].dropna().unique())
-        selected_season = st.selectbox("Season", seasons, key="julia_season")
-    with col2:
-        carriers = sorted(df_julia["carrier_name"].dropna().unique())
-        selected_carriers = st.multiselect("Carrier", carriers, key="julia_carriers")
-    with col3:
-        airports = sorted(df_julia["airport_code"].dropna().unique())
-        selected_airports = st.multiselect("Airport", airports, key="julia_airports")
+    # A form, so picking several carriers or airports reruns the tab once, on Apply
+    with st.form("julia_filters", border=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            seasons = ["All"] + sorted(trend_cube.seasons)
+            selected_season = st.selectbox("Season", seasons, key="julia_season")
+        with col2:
+            carriers = sorted(trend_cube.carriers)
+            selected_carriers = st.multiselect("Carrier", carriers, key="julia_carriers")
+        with col3:
+            airports = sorted(trend_cube.airports)
+            selected_airports = st.multiselect("Airport", airports, key="julia_airports")
+        st.form_submit_button("Apply")
     
-    df_julia_f = df_julia.copy()
-    if selected_season != "All":
-        df_julia_f = df_julia_f[df_julia_f["season"] == selected_season]
-    if selected_carriers:
-        df_julia_f = df_julia_f[df_julia_f["carrier_name"].isin(selected_carriers)]
-    if selected_airports:
-        df_julia_f = df_julia_f[df_julia_f["airport_code"].isin(selected_airports)]
+    season_julia = None if selected_season == "All" else selected_season
+    with profile.span("trends.kpis"):
+        kpis = queries.trend_kpis(season_julia, selected_carriers, selected_airports)
     
     k1, k2 = st.columns(2)
-    avg_delay = df_julia_f["avg_delay_min"].mean() if not df_julia_f.empty else 0
-    avg_rate = df_julia_f["delay_rate"].mean() if not df_julia_f.empty else 0
     with k1:
-        st.metric("Average Delay (min)", f"{avg_delay:.2f}")
+        st.metric("Average Delay (min)", f"{kpis['avg_delay_min']:.2f}")
     with k2:
-        st.metric("Delay Rate", f"{avg_rate:.1%}")
+        st.metric("Delay Rate", f"{kpis['delay_rate']:.1%}")
     
     st.divider()
     
-    group_var = None
-    if len(selected_carriers) > 1:
-        group_var = "carrier_name"
-    elif len(selected_airports) > 1:
-        group_var = "airport_code"
+    # Selections are normalized so reordering a multiselect reuses the cached figure
+    selection = (season_julia, tuple(sorted(selected_carriers)), tuple(sorted(selected_airports)))
     
     st.subheader("Average Delay Trend")
-    if not df_julia_f.empty:
-        if group_var:
-            df_trend = (df_julia_f.groupby(["date", group_var])["avg_delay_min"]
-                .mean().reset_index().sort_values("date"))
-            fig = px.line(df_trend, x="date", y="avg_delay_min", color=group_var, markers=True)
-        else:
-            df_trend = (df_julia_f.groupby("date")["avg_delay_min"]
-                .mean().reset_index().sort_values("date"))
-            fig = px.line(df_trend, x="date", y="avg_delay_min", markers=True)
-        
-        fig.update_layout(yaxis_title="Delay (min)", xaxis_title="", template="plotly_white")
-        st.plotly_chart(fig, width='stretch')
+    with profile.span("trends.figure"):
+        fig = load_trend_figure(version, "avg_delay_min", *selection)
+    if fig is not None:
+        with profile.span("trends.render"):
+            st.plotly_chart(fig, width='stretch')
     else:
         st.warning("No data available for selected filters.")
     
     st.divider()
     st.subheader("Delay Rate Trend")
-    if not df_julia_f.empty:
-        if group_var:
-            df_trend_rate = (df_julia_f.groupby(["date", group_var])["delay_rate"]
-                .mean().reset_index().sort_values("date"))
-            fig2 = px.line(df_trend_rate, x="date", y="delay_rate", color=group_var, markers=True)
-        else:
-            df_trend_rate = (df_julia_f.groupby("date")["delay_rate"]
-                .mean().reset_index().sort_values("date"))
-            fig2 = px.line(df_trend_rate, x="date", y="delay_rate", markers=True)
-        
-        fig2.update_layout(yaxis_title="Rate", xaxis_title="", template="plotly_white")
-        fig2.update_yaxes(tickformat=".1%")
-        st.plotly_chart(fig2, width='stretch')
+    with profile.span("trends.figure"):
+        fig2 = load_trend_figure(version, "delay_rate", *selection)
+    if fig2 is not None:
+        with profile.span("trends.render"):
+            st.plotly_chart(fig2, width='stretch')
     else:
         st.warning("No data available for selected filters.")
+    
+    finish_profile(profile)
 
 # Tab 2: Delay Causes
-with tab2:
+@st.fragment
+def causes_tab():
+    profile = RerunProfile("app.causes", session)
     st.header("Delay Causes Breakdown")
     
-    airport_risk = df_nessa.groupby("airport_name_cleansed").agg(
-        total_flights=("arr_flights", "sum"),
-        total_delays=("arr_del15", "sum")
-    )
-    airport_risk = airport_risk[airport_risk['total_flights'] >= 100000]
-    airport_risk['delay_pct'] = airport_risk['total_delays'] / airport_risk['total_flights']
-    top10_airports = airport_risk.sort_values('delay_pct', ascending=False).head(10).index.tolist()
+    with profile.span("causes.ranking"):
+        top10_airports = list(queries.risky_airports())
     
     col1, col2, col3 = st.columns(3)
     with col1:
         airport_nessa = st.selectbox("Airport", [None] + top10_airports, key="nessa_airport")
     with col2:
-        airlines = sorted(df_nessa['carrier_name'].unique()) if airport_nessa is None else sorted(df_nessa[df_nessa['airport_name_cleansed'] == airport_nessa]['carrier_name'].unique())
+        with profile.span("causes.airlines"):
+            airlines = list(queries.cause_carriers(airport_nessa))
         airline_nessa = st.selectbox("Airline", [None] + airlines, key="nessa_airline")
     with col3:
         season_nessa = st.selectbox("Season", [None, "Winter", "Spring", "Summer", "Fall"], key="nessa_season")
     
-    pie_df = df_nessa.copy()
-    if airport_nessa:
-        pie_df = pie_df[pie_df["airport_name_cleansed"] == airport_nessa]
-    if airline_nessa:
-        pie_df = pie_df[pie_df["carrier_name"] == airline_nessa]
-    
-    if season_nessa:
-        season_map = {"Winter": [12, 1, 2], "Spring": [3, 4, 5], "Summer": [6, 7, 8], "Fall": [9, 10, 11]}
-        pie_df = pie_df[pie_df["month"].isin(season_map[season_nessa])]
-    
-    pie_df = pie_df.groupby("carrier_name")[["arr_flights", "carrier_ct", "weather_ct", "nas_ct", "security_ct", "late_aircraft_ct"]].sum()
-    total_flights = pie_df["arr_flights"].sum()
-    
-    if total_flights > 0:
-        values = [
-            pie_df["carrier_ct"].sum() / total_flights,
-            pie_df["weather_ct"].sum() / total_flights,
-            pie_df["nas_ct"].sum() / total_flights,
-            pie_df["security_ct"].sum() / total_flights,
-            pie_df["late_aircraft_ct"].sum() / total_flights
-        ]
-        labels = ["Carrier", "Weather", "NAS", "Security", "Late Aircraft"]
+    weight = st.radio("Weight causes by", ["Delayed flights", "Delay minutes"], horizontal=True, key="nessa_weight")
+    
+    with profile.span("causes.breakdown"):
+        breakdown = queries.cause_breakdown(airport_nessa, airline_nessa, season_nessa)
+    
+    share = "count_share" if weight == "Delayed flights" else "minute_share"
+    if not breakdown.empty and breakdown[share].any():
+        values = breakdown[share].tolist()
+        labels = breakdown.index.tolist()
         
-        fig = px.pie(values=values, names=labels, color_discrete_sequence=["#FF6B6B", "#4ECDC4", "#45B7D1", "#FFA07A", "#98D8C8"])
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        fig.update_layout(template="plotly_white")
-        st.plotly_chart(fig, width='stretch')
+        with profile.span("causes.figure"):
+            import plotly.express as px
+            fig = px.pie(values=values, names=labels, color_discrete_sequence=["#FF6B6B", "#4ECDC4", "#45B7D1", "#FFA07A", "#98D8C8"])
+            fig.update_traces(textposition='inside', textinfo='percent+label')
+            fig.update_layout(template="plotly_white")
+        with profile.span("causes.render"):
+            st.plotly_chart(fig, width='stretch')
         
         st.divider()
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -181,50 +178,82 @@ with tab2:
                 st.metric(label, f"{val:.1%}")
     else:
         st.warning("No data available")
+    
+    finish_profile(profile)
 
-with tab3:
+# Tab 3: Airport Analysis
+@st.fragment
+def airport_tab():
+    profile = RerunProfile("app.airport", session)
     st.header("Airport Analysis")
     
-    airport_display = df_jordan['city'] + " (" + df_jordan['airport_code'] + ")"
-    airlines = ["All"] + sorted(df_jordan["carrier_name"].unique())
-    airports = ["All"] + sorted(airport_display.unique())
+    airlines = ["All"] + sorted(data.airport_index.values["carrier_name"])
+    airports = ["All"] + sorted(data.airport_index.values["airport_label"])
     
     left, right = st.columns([1, 3])
     
     with left:
-        airline = st.selectbox("Airline", airlines, index=0, key="jordan_airline")
-        airport = st.selectbox("Airport", airports, index=0, key="jordan_airport")
-        months = st.slider("Months", 1, 12, (1, 12), key="jordan_months")
-    
-    df_f = df_jordan.copy()
-    if airline != "All":
-        df_f = df_f[df_f["carrier_name"] == airline]
-    if airport != "All":
-        airport_display_f = df_f['city'] + " (" + df_f['airport_code'] + ")"
-        df_f = df_f[airport_display_f == airport]
-    df_f = df_f[(df_f["month"] >= months[0]) & (df_f["month"] <= months[1])]
+        airline = st.selectbox("Airline", airlines, key="jordan_airline")
+        airport = st.selectbox("Airport", airports, key="jordan_airport")
+        months = st.slider("Months", 1, 12, key="jordan_months")
+    
+    selection = (None if airline == "All" else airline, None if airport == "All" else airport, months)
+    with profile.span("airport.filter") as span:
+        summary = queries.airport_summary(*selection)
+        span.rows = summary["rows"]
     
     with right:
         col1, col2, col3 = st.columns(3)
-        col1.metric("Avg Delay (min)", f"{df_f['arr_delay'].mean():.1f}" if not df_f.empty else "N/A")
-        col2.metric("Total Flights", f"{len(df_f):,}" if not df_f.empty else "0")
-        if "arr_del15" in df_f.columns and not df_f.empty:
-            delay_pct = (df_f["arr_del15"] == 1).sum() / len(df_f) * 100
-            col3.metric("Delayed %", f"{delay_pct:.1f}%")
+        col1.metric("Avg Delay (min)", f"{summary['avg_delay']:.1f}" if summary["rows"] else "N/A")
+        col2.metric("Total Flights", f"{summary['rows']:,}")
+        if summary["rows"]:
+            col3.metric("Delayed %", f"{summary['delayed_share'] * 100:.1f}%")
         else:
             col3.metric("Delayed %", "N/A")
         
         st.divider()
         
-        if not df_f.empty:
-            agg = df_f.groupby("airport_code")["arr_delay"].median().head(10)
-            fig = px.bar(x=agg.index, y=agg.values, labels={"x": "Airport", "y": "Median Delay (min)"})
-            fig.update_layout(template="plotly_white")
-            st.plotly_chart(fig, width='stretch')
+        if summary["rows"]:
+            with profile.span("airport.median"):
+                agg = queries.airport_medians(*selection).head(10)
+            with profile.span("airport.figure"):
+                import plotly.express as px
+                fig = px.bar(x=agg.index, y=agg.values, labels={"x": "Airport", "y": "Median Delay (min)"})
+                fig.update_layout(template="plotly_white")
+            with profile.span("airport.render"):
+                st.plotly_chart(fig, width='stretch')
     
     st.divider()
     st.subheader("Data")
-    if not df_f.empty:
-        st.dataframe(df_f, width='stretch')
+    if summary["rows"]:
+        with profile.span("airport.table", rows=summary["rows"]):
+            rows = queries.airport_rows(*selection)
+            paged_dataframe(df_jordan, rows, queries.AIRPORT_VIEW_COLUMNS, key="jordan_grid", width='stretch')
     else:
         st.info("No data available")
+    
+    finish_profile(profile)
+
+
+# A hidden tab renders no widgets, and Streamlit drops the state of widgets that were not
+# rendered; re-assigning the filters keeps each tab's selections across tab switches. Their
+# defaults live here rather than on the widgets, which Streamlit rejects for state set this way.
+FILTER_DEFAULTS = {
+    "julia_season": "All", "julia_carriers": [], "julia_airports": [],
+    "nessa_airport": None, "nessa_airline": None, "nessa_season": None, "nessa_weight": "Delayed flights",
+    "jordan_airline": "All", "jordan_airport": "All", "jordan_months": (1, 12),
+}
+for key, default in FILTER_DEFAULTS.items():
+    st.session_state[key] = st.session_state.get(key, default)
+
+# Only the open tab runs: switching tabs reruns the script, and widgets inside a tab rerun just it.
+# Tabs that report whether they are open arrived in Streamlit 1.55; before that every tab runs.
+TAB_LABELS = ["Delay Trends", "Delay Causes", "Airport Analysis"]
+LAZY_TABS = "on_change" in inspect.signature(st.tabs).parameters
+tabs = st.tabs(TAB_LABELS, key="tab", on_change="rerun") if LAZY_TABS else st.tabs(TAB_LABELS)
+for tab, body in zip(tabs, [trends_tab, causes_tab, airport_tab]):
+    if not LAZY_TABS or tab.open:
+        with tab:
+            body()
+
+finish_profile(profile)
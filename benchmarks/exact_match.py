@@ -0,0 +1,97 @@
+"""Regression benchmark: regex str.contains filtering vs exact categorical lookups.
+
+nessa_files/app.py used to filter the Delay Causes frame with
+``.str.contains(name, case=False)`` on airport and airline names and sum the
+cause columns of the matching rows. It now asks ``queries.cause_breakdown``,
+whose CauseEngine sums per-cell totals picked by exact category codes. This
+script times both over every airport/airline pair, checks they give the same
+totals wherever no name is a substring of another, and fails if the exact
+path is not faster.
+
+    python -m benchmarks.exact_match --scale 50
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from delays.causes import TOTAL_COLUMNS, CauseEngine
+from delays.store import read_store
+
+COLUMNS = ["year", "month", "carrier_name", "airport_name_cleansed", *TOTAL_COLUMNS]
+
+
+def regex_totals(df: pd.DataFrame, airport: str, airline: str) -> np.ndarray:
+    """The old nessa_files/app.py filter and sums."""
+    mask = df["airport_name_cleansed"].str.contains(airport, case=False, na=False)
+    mask &= df["carrier_name"].str.contains(airline, case=False, na=False)
+    return df.loc[mask, TOTAL_COLUMNS].sum().to_numpy(np.float64)
+
+
+def exact_totals(engine: CauseEngine, airport: str, airline: str) -> np.ndarray:
+    """The cell-total path behind queries.cause_breakdown."""
+    return engine.totals(airport_name_cleansed=airport, carrier_name=airline).to_numpy()
+
+
+def best_of(repeat: int, func, *args) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def has_substring_clash(name: str, names: list) -> bool:
+    return any(name.lower() in other.lower() for other in names if other != name)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=20, help="times to tile the store rows")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-speedup", type=float, default=1.0)
+    args = parser.parse_args()
+
+    base = read_store(COLUMNS, filters=[("year", ">=", 2014), ("year", "<=", 2019)])
+    df = pd.concat([base] * args.scale, ignore_index=True)
+    # The old app read the CSV without dtypes, so its regex ran over object columns.
+    df_text = df.astype({"airport_name_cleansed": object, "carrier_name": object})
+
+    start = time.perf_counter()
+    engine = CauseEngine(df)
+    build = time.perf_counter() - start
+
+    airports = sorted(engine.lookup["airport_name_cleansed"])
+    airlines = sorted(engine.lookup["carrier_name"])
+    regex_total = exact_total = 0.0
+    mismatches = []
+    for airport in airports:
+        for airline in airlines:
+            expected = regex_totals(df_text, airport, airline)
+            got = exact_totals(engine, airport, airline)
+            clash = has_substring_clash(airport, airports) or has_substring_clash(airline, airlines)
+            if not clash and not np.allclose(expected, got, rtol=1e-6):
+                mismatches.append((airport, airline))
+            regex_total += best_of(args.repeat, regex_totals, df_text, airport, airline)
+            exact_total += best_of(args.repeat, exact_totals, engine, airport, airline)
+
+    pairs = len(airports) * len(airlines)
+    speedup = regex_total / exact_total
+    print(f"rows: {len(df):,}  pairs: {pairs}  engine build: {build * 1e3:.1f} ms")
+    print(f"str.contains: {regex_total / pairs * 1e3:8.3f} ms/query")
+    print(f"exact cells:  {exact_total / pairs * 1e3:8.3f} ms/query  ({speedup:.0f}x)")
+
+    if mismatches:
+        print(f"FAIL: {len(mismatches)} selections differ, e.g. {mismatches[0]}")
+        return 1
+    if speedup < args.min_speedup:
+        print(f"FAIL: speedup {speedup:.1f}x is below {args.min_speedup}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Concurrent-session load test for the dashboard entry points.
+
+N simulated sessions run an entry point's scripted interactions (switching
+tabs, picking carriers and airports, moving the month slider, ...) at the
+same time. Each session is a fresh process driving one ``streamlit.testing``
+AppTest, which supports a single running app per process, so sessions are
+like users of separate server workers: they share the store's rows in shared
+memory and the disk cache, not in-process caches. Every process opens the
+page, then all of them start their scenario together. Each concurrency level
+reports rerun latency percentiles, reruns per second and peak RSS, per session
+process and summed (shared-memory pages count in every process).
+
+AppTest cannot rerun a single fragment: widgets inside app.py's tabs rerun
+the whole script here, so their latencies are an upper bound and the
+fragment reruns of a real session are not measured.
+
+    python -m benchmarks.load --sessions 1 2 4 8 --iterations 3
+    python -m benchmarks.load --entry julia_files/app.py --sessions 1 4 --output benchmarks/results/load.json
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.startup import prepare_snapshot
+from benchmarks.suite import peak_rss_mb
+
+ROOT = Path(__file__).resolve().parent.parent
+PERCENTILES = [50, 90, 99]
+
+
+def _pick(rng, options, low: int = 1, high: int = 3) -> list:
+    return [str(o) for o in rng.choice(options, int(rng.integers(low, high + 1)), replace=False)]
+
+
+def _submit(at, label: str = "Apply") -> None:
+    next(b for b in at.button if b.label == label).click()
+
+
+def _open(tab: str):
+    def step(at, rng, state):
+        state["tab"] = tab
+    return step
+
+
+def _trend_carriers(at, rng, state):
+    ms = at.multiselect(key="julia_carriers")
+    ms.set_value(_pick(rng, ms.options))
+    _submit(at)
+
+
+def _trend_airports(at, rng, state):
+    ms = at.multiselect(key="julia_airports")
+    ms.set_value(_pick(rng, ms.options))
+    _submit(at)
+
+
+def _cause_airport(at, rng, state):
+    sb = at.selectbox(key="nessa_airport")
+    sb.set_value(sb.options[int(rng.integers(len(sb.options)))] or None)
+
+
+def _cause_season(at, rng, state):
+    at.selectbox(key="nessa_season").set_value(str(rng.choice(["Winter", "Spring", "Summer", "Fall"])))
+
+
+def _airport_airline(at, rng, state):
+    sb = at.selectbox(key="jordan_airline")
+    sb.set_value(sb.options[int(rng.integers(len(sb.options)))])
+
+
+def _airport_months(at, rng, state):
+    lo = int(rng.integers(1, 13))
+    at.slider(key="jordan_months").set_value((lo, int(rng.integers(lo, 13))))
+
+
+def _julia_filters(at, rng, state):
+    at.multiselect[0].set_value(_pick(rng, at.multiselect[0].options))
+    at.selectbox[0].set_value(str(rng.choice(at.selectbox[0].options)))
+
+
+def _jordan_filters(at, rng, state):
+    airline, airport = at.sidebar.selectbox[0], at.sidebar.selectbox[1]
+    airline.set_value(airline.options[int(rng.integers(len(airline.options)))])
+    airport.set_value(airport.options[int(rng.integers(len(airport.options)))])
+
+
+def _jordan_months(at, rng, state):
+    lo = int(rng.integers(0, 13))
+    at.sidebar.slider[0].set_value((lo, int(rng.integers(lo, 13))))
+
+
+def _jordan_cap(at, rng, state):
+    checkbox = at.sidebar.checkbox[0]
+    checkbox.set_value(not checkbox.value)
+
+
+def _nessa_filters(at, rng, state):
+    for sb in at.selectbox:
+        sb.set_value(sb.options[int(rng.integers(len(sb.options)))] if sb.options else None)
+
+
+# One pass of interactions per entry point; each step is followed by a rerun.
+SCENARIOS = {
+    "app.py": [
+        _trend_carriers, _trend_airports,
+        _open("Delay Causes"), _cause_airport, _cause_season,
+        _open("Airport Analysis"), _airport_airline, _airport_months,
+        _open("Delay Trends"),
+    ],
+    "jordan_files/app.py": [_jordan_filters, _jordan_months, _jordan_cap, _jordan_filters],
+    "julia_files/app.py": [_julia_filters, _julia_filters, _julia_filters],
+    "nessa_files/app.py": [_nessa_filters, _nessa_filters, _nessa_filters],
+}
+
+
+def _session(entry: str, seed: int, iterations: int, barrier) -> dict:
+    """One simulated user in its own process: open the page, wait for the others, replay the scenario."""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT / Path(entry).parent)
+    # AppTest runs in bare mode, where Streamlit warns on each session-state access outside a script run.
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage())
+    rng = np.random.default_rng(seed)
+    state = {}
+    latencies, errors = [], []
+    at = AppTest.from_file(str(ROOT / entry), default_timeout=600)
+
+    def rerun():
+        # AppTest does not send the selected tab back like a browser does, so it is set every rerun.
+        if "tab" in state:
+            at.session_state["tab"] = state["tab"]
+        start = time.perf_counter()
+        at.run()
+        if at.exception:
+            errors.append(at.exception[0].value)
+        return time.perf_counter() - start
+
+    try:
+        # Opening the page imports the app and attaches the data; it is not an interaction, so untimed.
+        rerun()
+    except Exception as exc:
+        errors.append(repr(exc))
+    barrier.wait()
+
+    started = time.time()
+    try:
+        for _ in range(iterations):
+            for step in SCENARIOS[entry]:
+                step(at, rng, state)
+                latencies.append(rerun())
+    except Exception as exc:
+        errors.append(repr(exc))
+    return {"latencies": latencies, "errors": errors, "started": started, "finished": time.time(),
+            "peak_rss_mb": peak_rss_mb()}
+
+
+def run_level(entry: str, sessions: int, iterations: int) -> dict:
+    """sessions users at once, each in a fresh process; latency percentiles, reruns/s and peak RSS."""
+    context = get_context("spawn")
+    with context.Manager() as manager, ProcessPoolExecutor(sessions, mp_context=context) as pool:
+        barrier = manager.Barrier(sessions)
+        futures = [pool.submit(_session, entry, seed, iterations, barrier) for seed in range(sessions)]
+        runs = [future.result() for future in futures]
+
+    ms = np.array([t for run in runs for t in run["latencies"]]) * 1e3
+    wall = max(run["finished"] for run in runs) - min(run["started"] for run in runs)
+    return {
+        "sessions": sessions,
+        "reruns": len(ms),
+        "errors": sum(len(run["errors"]) for run in runs),
+        **{f"p{p}_ms": float(np.percentile(ms, p)) if len(ms) else np.nan for p in PERCENTILES},
+        "max_ms": float(ms.max()) if len(ms) else np.nan,
+        "reruns_per_s": len(ms) / wall,
+        "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+        "total_rss_mb": sum(run["peak_rss_mb"] for run in runs),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entry", choices=list(SCENARIOS), default="app.py")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--iterations", type=int, default=3, help="scenario passes per session")
+    parser.add_argument("--output", type=Path, help="JSON results file (default: print only)")
+    args = parser.parse_args()
+
+    # Sessions start from the deployed snapshot, as new workers do.
+    prepare_snapshot(dict(os.environ))
+    results = []
+    print(f"{args.entry}: {len(SCENARIOS[args.entry])} interactions x {args.iterations} per session")
+    for sessions in args.sessions:
+        result = run_level(args.entry, sessions, args.iterations)
+        results.append(result)
+        print(f"{sessions:>4} sessions  {result['reruns']:>5} reruns"
+              + "".join(f"  p{p} {result[f'p{p}_ms']:7.0f} ms" for p in PERCENTILES)
+              + f"  max {result['max_ms']:7.0f} ms  {result['reruns_per_s']:6.1f} reruns/s"
+              f"  {result['peak_rss_mb']:6.1f} MB/session  {result['total_rss_mb']:7.1f} MB total"
+              + (f"  {result['errors']} ERRORS" if result["errors"] else ""))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"entry": args.entry, "iterations": args.iterations,
+                                           "results": results}, indent=1))
+        print(f"Wrote {args.output}")
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Time to first paint of every dashboard entry point, from a fresh process.
+
+Each entry point is run in a new Python process with ``streamlit.testing``.
+The report gives, from process launch: when the script starts (interpreter
+and Streamlit imports), when its first element is sent to the browser (first
+paint) and when the run finishes (full render). Medians of --repeat launches.
+
+"cold" is a new host: empty shared memory and disk cache. "warm" is a worker
+started after ``python -m delays.queries`` prepared the snapshot (the store,
+its shared-memory table and the disk-cached engines), as a deploy would.
+
+    python -m benchmarks.startup --repeat 5 --output benchmarks/results/startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ["app.py", "jordan_files/app.py", "julia_files/app.py", "nessa_files/app.py"]
+STAGES = ["script_start", "first_paint", "full_render"]
+
+
+def _child(entry: str, launched: float) -> dict:
+    """Runs in the measured process: timestamps of the script start, first element and end."""
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+
+    marks = {}
+    enqueue = ScriptRunContext.enqueue
+
+    def timed_enqueue(self, msg):
+        if "first_paint" not in marks and msg.HasField("delta"):
+            marks["first_paint"] = time.time() - launched
+        return enqueue(self, msg)
+
+    ScriptRunContext.enqueue = timed_enqueue
+    at = AppTest.from_file(str(ROOT / entry), default_timeout=600)
+    marks["script_start"] = time.time() - launched
+    at.run()
+    marks["full_render"] = time.time() - launched
+    if at.exception:
+        raise RuntimeError(f"{entry}: {at.exception[0].value}")
+    return marks
+
+
+def measure(entry: str, env: dict) -> dict:
+    """Launching one fresh process for entry and returning its marks in seconds."""
+    launched = time.time()
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", entry, "--launched", repr(launched)],
+        cwd=ROOT / Path(entry).parent, env={**env, "PYTHONPATH": str(ROOT)},
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def prepare_snapshot(env: dict) -> None:
+    subprocess.run([sys.executable, "-m", "delays.queries"], cwd=ROOT, env=env, check=True,
+                   capture_output=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", nargs="+", choices=ENTRY_POINTS, default=ENTRY_POINTS)
+    parser.add_argument("--modes", nargs="+", choices=["cold", "warm"], default=["cold", "warm"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="JSON report file (default: print only)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--launched", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.launched)))
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            for entry in args.entries:
+                runs = []
+                for i in range(args.repeat):
+                    env = dict(os.environ)
+                    if mode == "cold":
+                        # A new host per launch: nothing in shared memory or the disk cache yet.
+                        env["DELAYS_SHARED_DIR"] = str(Path(tmp) / f"shared-{entry}-{i}")
+                        env["DELAYS_CACHE_DIR"] = str(Path(tmp) / f"cache-{entry}-{i}")
+                    else:
+                        env["DELAYS_SHARED_DIR"] = str(Path(tmp) / "shared")
+                        env["DELAYS_CACHE_DIR"] = str(Path(tmp) / "cache")
+                        if not runs:
+                            prepare_snapshot(env)
+                    runs.append(measure(entry, env))
+                result = {"entry": entry, "mode": mode,
+                          **{stage: statistics.median(r[stage] for r in runs) for stage in STAGES}}
+                results.append(result)
+                print(f"{entry:<22} {mode:<5}" + "".join(f"  {s} {result[s] * 1e3:7.0f} ms" for s in STAGES))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"repeat": args.repeat, "results": results}, indent=1))
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
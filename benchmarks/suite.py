@@ -0,0 +1,376 @@
+"""Benchmark suite for the dashboards' loading, filtering and aggregation paths.
+
+Every case runs at every scale of the synthetic data (see
+``benchmarks.synthetic``) in a fresh process, so its peak RSS is its own.
+Wall time is the best of --repeat runs; rows/s divides the rows a run
+processes by it. Results are written as JSON, one file per commit, and can be
+checked against an earlier file:
+
+    python -m benchmarks.suite --scales 1 10 100 --output benchmarks/results/HEAD.json
+    python -m benchmarks.suite --scales 1 10 --baseline benchmarks/results/main.json --max-regression 1.25
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+QUERIES = 20
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _jordan_filters():
+    sys.path.insert(0, str(ROOT / "jordan_files"))
+    import filters
+    return filters
+
+
+def _dataset(ctx):
+    from delays.queries import Dataset
+    from delays.store import read_manifest
+    return Dataset(read_manifest(ctx["store"]), ctx["store"])
+
+
+def _selections(df, rng) -> list:
+    """Random Airport Analysis selections: airline, airport label, month range."""
+    carriers = sorted(df["carrier_name"].unique())
+    airports = sorted(df["airport_label"].unique())
+    out = []
+    for _ in range(QUERIES):
+        lo = int(rng.integers(1, 13))
+        out.append({
+            "airline": "All" if rng.random() < 0.3 else str(rng.choice(carriers)),
+            "airport": "All" if rng.random() < 0.5 else str(rng.choice(airports)),
+            "rt_range": (lo, int(rng.integers(lo, 13))),
+            "cap_outliers": bool(rng.random() < 0.3),
+        })
+    return out
+
+
+def case_dataset_build(ctx):
+    """delays/queries.py: attach the shared rows and build every query engine of a store version."""
+    import pandas as pd
+    from delays.queries import ENGINES
+    from delays.shared import shared_path
+    pd.set_option("mode.copy_on_write", True)
+
+    def run():
+        shared_path("rows", ctx["version"], ctx["store"]).unlink(missing_ok=True)
+        data = _dataset(ctx)
+        for engine in ENGINES:
+            getattr(data, engine)
+        return data
+
+    return run, len(run().table)
+
+
+def case_store_build(ctx):
+    """Write every month of the CSV into a fresh store."""
+    import pandas as pd
+    from delays.store import write_partitions
+    df = pd.read_csv(ctx["csv"])
+    df["reduced"] = True
+    target = Path(ctx["tmp"]) / "store"
+    return lambda: write_partitions(df.copy(), target), len(df)
+
+
+def case_app_loaders(ctx):
+    """app.py loaders: publish the shared table, attach it and build the tab views."""
+    import pandas as pd
+    from delays.shared import read_shared, shared_path
+    from delays.views import View
+    pd.set_option("mode.copy_on_write", True)
+
+    def run():
+        shared_path("rows", ctx["version"], ctx["store"]).unlink(missing_ok=True)
+        table = read_shared("rows", ctx["version"], path=ctx["store"])
+        View(table, table["reduced"].to_numpy()).frame
+        View(table, table["year"].between(2014, 2019).to_numpy()).frame
+        return table
+
+    return run, len(run())
+
+
+def case_apply_filters(ctx):
+    """jordan_files/filters.py::apply_filters over random selections, index and quantiles prebuilt."""
+    import pandas as pd
+    filters = _jordan_filters()
+    pd.set_option("mode.copy_on_write", True)
+    data = _dataset(ctx)
+    df, index, quantiles = data.airport_view.frame, data.airport_index, data.airport_quantiles
+    selections = _selections(df, np.random.default_rng(0))
+    return lambda: [filters.apply_filters(df, s, index, quantiles) for s in selections], len(df) * QUERIES
+
+
+def _trend_queries(df, rng) -> list:
+    carriers = sorted(df["carrier_name"].unique())
+    airports = sorted(df["airport_code"].unique())
+    return [(
+        None if rng.random() < 0.5 else str(rng.choice(["Winter", "Spring", "Summer", "Fall"])),
+        [str(c) for c in rng.choice(carriers, int(rng.integers(0, 3)), replace=False)],
+        [str(a) for a in rng.choice(airports, int(rng.integers(0, 3)), replace=False)],
+    ) for _ in range(QUERIES)]
+
+
+def case_trend_cube(ctx):
+    """app.py Delay Trends: build the cube from the partition partials, then answer queries."""
+    from delays.cube import TrendCube
+    from delays.store import read_aggregates, read_store
+    df = read_store(["carrier_name", "airport_code"], path=ctx["store"])
+    queries = _trend_queries(df, np.random.default_rng(0))
+
+    def run():
+        cube = TrendCube(read_aggregates("trend_cube", path=ctx["store"]))
+        for season, carriers, airports in queries:
+            by = "carrier_name" if len(carriers) > 1 else "airport_code" if len(airports) > 1 else None
+            cube.kpis(season, carriers, airports)
+            cube.trend("avg_delay_min", season, carriers, airports, by=by)
+            cube.trend("delay_rate", season, carriers, airports, by=by)
+
+    return run, len(df) * QUERIES
+
+
+def case_trend_groupby(ctx):
+    """julia_files/app.py Delay Trends: mask the rows, then group by date per query."""
+    from delays.store import read_store
+    df = read_store(["date", "season", "carrier_name", "airport_code", "delay_rate", "avg_delay_min"],
+                    path=ctx["store"])
+    queries = _trend_queries(df, np.random.default_rng(0))
+
+    def run():
+        for season, carriers, airports in queries:
+            mask = np.ones(len(df), dtype=bool)
+            if season:
+                mask &= (df["season"] == season).to_numpy()
+            if carriers:
+                mask &= df["carrier_name"].isin(carriers).to_numpy()
+            if airports:
+                mask &= df["airport_code"].isin(airports).to_numpy()
+            df_f = df[mask]
+            df_f[["delay_rate", "avg_delay_min"]].mean()
+            df_f.groupby("date")[["avg_delay_min", "delay_rate"]].mean()
+
+    return run, len(df) * QUERIES
+
+
+def case_airport_risk(ctx):
+    """app.py Delay Causes: rank airports by share of delayed flights."""
+    from delays.lookups import top_risky_airports
+    from delays.store import read_store
+    df = read_store(["airport_name_cleansed", "arr_flights", "arr_del15"], path=ctx["store"])
+    return lambda: top_risky_airports(df), len(df)
+
+
+def case_cause_breakdown(ctx):
+    """app.py Delay Causes pie: build the cause engine, then break down every airport and season."""
+    from delays.causes import TOTAL_COLUMNS, CauseEngine
+    from delays.store import read_store
+    from delays.transforms import SEASON_MONTHS
+    df = read_store(["airport_name_cleansed", "carrier_name", "year", "month", *TOTAL_COLUMNS],
+                    path=ctx["store"])
+    airports = [None, *sorted(df["airport_name_cleansed"].unique())[:10]]
+
+    def run():
+        engine = CauseEngine(df)
+        for airport in airports:
+            for months in [None, *SEASON_MONTHS.values()]:
+                engine.breakdown(airport_name_cleansed=airport, month=months)
+
+    return run, len(df)
+
+
+def case_queries(ctx):
+    """delays/queries.py: trends, cause breakdowns and airport medians, engines built and results uncached."""
+    import pandas as pd
+    from delays import queries
+    pd.set_option("mode.copy_on_write", True)
+    filters = _jordan_filters()
+    data = queries.dataset(ctx["store"])
+    rng = np.random.default_rng(0)
+    trends = _trend_queries(data.table, rng)
+    selections = [filters.query_filters(s) for s in _selections(data.airport_view.frame, rng)]
+    causes = [None, *sorted(data.cause_view.frame["airport_name_cleansed"].unique())[:QUERIES - 1]]
+    memoized = [queries._trends, queries._trend_kpis, queries._cause_breakdown, queries._airport_totals,
+                queries._airport_medians]
+
+    def run():
+        for cache in memoized:
+            cache.cache_clear()
+        for season, carriers, airports in trends:
+            queries.trends("avg_delay_min", season, carriers, airports, path=ctx["store"])
+            queries.trend_kpis(season, carriers, airports, path=ctx["store"])
+        for airport in causes:
+            queries.cause_breakdown(airport, season="Summer", path=ctx["store"])
+        for selection in selections:
+            queries.airport_summary(**selection, path=ctx["store"])
+            queries.airport_medians(**selection, path=ctx["store"])
+
+    return run, len(data.table) * QUERIES
+
+
+def case_warm_start(ctx):
+    """delays/queries.py after a restart: every engine and the default queries from a warm disk cache."""
+    os.environ["DELAYS_CACHE_DIR"] = str(ctx["cache"])
+    from delays import queries
+    memoized = [queries._trends, queries._trend_kpis, queries._risky_airports, queries._cause_carriers,
+                queries._cause_breakdown, queries._airport_totals, queries._airport_medians]
+
+    def run():
+        queries._datasets.clear()
+        for cache in memoized:
+            cache.cache_clear()
+        data = queries.prepare(ctx["store"])
+        queries.trends("avg_delay_min", path=ctx["store"])
+        queries.trend_kpis(path=ctx["store"])
+        queries.cause_carriers(queries.risky_airports(path=ctx["store"])[0], path=ctx["store"])
+        queries.cause_breakdown(path=ctx["store"])
+        queries.airport_summary(path=ctx["store"])
+        queries.airport_medians(path=ctx["store"])
+        return data
+
+    # The first run fills the cache; the timed runs start warm.
+    return run, len(run().table)
+
+
+CASES = {
+    "dataset_build": case_dataset_build,
+    "store_build": case_store_build,
+    "app_loaders": case_app_loaders,
+    "apply_filters": case_apply_filters,
+    "trend_cube": case_trend_cube,
+    "trend_groupby": case_trend_groupby,
+    "airport_risk": case_airport_risk,
+    "cause_breakdown": case_cause_breakdown,
+    "queries": case_queries,
+    "warm_start": case_warm_start,
+}
+
+
+def _run_case(name: str, ctx: dict, repeat: int) -> dict:
+    """Runs in a fresh process: set up, time, and report this process's peak RSS."""
+    os.environ["DELAYS_SHARED_DIR"] = str(ctx["shared"])
+    # Cases time the work itself; warm_start turns the disk cache back on.
+    os.environ["DELAYS_CACHE_DIR"] = ""
+    sys.path.insert(0, str(ROOT))
+    run, rows = CASES[name](ctx)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    wall = min(times)
+    return {"rows": rows, "wall_s": wall, "rows_per_s": rows / wall, "peak_rss_mb": peak_rss_mb()}
+
+
+def prepare(scale: int, workdir: Path) -> dict:
+    """Writing the synthetic CSV and store for one scale."""
+    from benchmarks.synthetic import synthetic_frame
+    from delays.store import manifest_version, read_manifest, write_partitions
+
+    base = workdir / f"{scale}x"
+    base.mkdir(parents=True, exist_ok=True)
+    df = synthetic_frame(scale)
+    csv = base / "delays.csv"
+    df.drop(columns="reduced").to_csv(csv, index=False)
+    store = base / "store"
+    write_partitions(df, store)
+    return {
+        "scale": scale,
+        "csv": csv,
+        "store": store,
+        "version": manifest_version(read_manifest(store)),
+        "shared": base / "shared",
+        "cache": base / "cache",
+        "tmp": base / "tmp",
+    }
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: list, baseline: dict, max_regression: float) -> list:
+    """Printing wall-time ratios against a baseline file; returns the regressions."""
+    before = {(r["case"], r["scale"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nvs {baseline['meta']['commit']}:")
+    for r in results:
+        old = before.get((r["case"], r["scale"]))
+        if old is None:
+            continue
+        ratio = r["wall_s"] / old["wall_s"]
+        flag = "  REGRESSION" if ratio > max_regression else ""
+        print(f"  {r['case']:<18} {r['scale']:>4}x  {ratio:6.2f}x time{flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="JSON results file (default: print only)")
+    parser.add_argument("--baseline", type=Path, help="earlier JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=1.25,
+                        help="fail when a case is this many times slower than the baseline")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            ctx = prepare(scale, Path(tmp))
+            for name in args.cases:
+                # A fresh process per case keeps peak RSS and caches from leaking between cases.
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    result = {"case": name, "scale": scale, **pool.submit(_run_case, name, ctx, args.repeat).result()}
+                results.append(result)
+                print(f"{name:<18} {scale:>4}x  {result['rows']:>11,} rows  {result['wall_s'] * 1e3:10.1f} ms"
+                      f"  {result['rows_per_s']:>14,.0f} rows/s  {result['peak_rss_mb']:8.1f} MB")
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=1))
+        print(f"Wrote {args.output}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Synthetic BTS-shaped data at any multiple of the shipped CSV.
+
+Scale k tiles ``csv/delays_reduced.csv`` k times. Copy i > 0 gets its own
+airports (``ATL`` becomes ``ATL3``, "Atlanta" becomes "Atlanta 3", ...) so
+every (year_month, carrier, airport) key stays unique, and its counts and
+minutes are jittered so groupings and rankings are not just repeated.
+
+    python -m benchmarks.synthetic --scale 10 --output /tmp/delays_10x.csv
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from delays.store import CSV_DIR
+
+NUMERIC_COLUMNS = [
+    "arr_flights", "arr_del15", "carrier_ct", "weather_ct", "nas_ct", "security_ct",
+    "late_aircraft_ct", "arr_cancelled", "arr_diverted", "arr_delay", "carrier_delay",
+    "weather_delay", "nas_delay", "security_delay", "late_aircraft_delay",
+]
+AIRPORT_COLUMNS = ["airport_code", "city", "airport_full_name", "airport_name_cleansed"]
+
+
+def synthetic_frame(scale: int, seed: int = 0) -> pd.DataFrame:
+    """scale copies of the reduced CSV with distinct airports, flagged as reduced."""
+    base = pd.read_csv(CSV_DIR / "delays_reduced.csv")
+    rng = np.random.default_rng(seed)
+    copies = []
+    for i in range(scale):
+        copy = base.copy()
+        if i:
+            for col in AIRPORT_COLUMNS:
+                copy[col] = copy[col] + (str(i) if col == "airport_code" else f" {i}")
+            copy[NUMERIC_COLUMNS] = (copy[NUMERIC_COLUMNS] * rng.uniform(0.5, 1.5, (len(copy), 1))).round()
+        copies.append(copy)
+    df = pd.concat(copies, ignore_index=True)
+    df["reduced"] = True
+    return df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic delays CSV.")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.scale, args.seed)
+    df.drop(columns="reduced").to_csv(args.output, index=False)
+    print(f"Wrote {len(df):,} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared data layer for the airline delay dashboards."""
@@ -0,0 +1,20 @@
+"""Pre-aggregates written next to every store partition.
+
+Each entry maps an aggregate name to a function of one partition's rows that
+returns a small frame. They are computed when a partition is written, so new
+months only aggregate their own rows; readers concatenate the partitions they
+need.
+"""
+import pandas as pd
+
+from delays.cube import cube_partial
+
+
+def trend_cube(part: pd.DataFrame) -> pd.DataFrame:
+    """Delay Trends cube partial over the reduced rows."""
+    return cube_partial(part[part["reduced"]])
+
+
+AGGREGATES = {
+    "trend_cube": trend_cube,
+}
@@ -0,0 +1,49 @@
+"""Small in-process caches keyed by dataset version.
+
+Lookups derived from a dataset are the same for every user until the data
+changes, so they are memoized on a version token plus their own arguments.
+The dataset itself is passed alongside but never hashed, and like in
+``st.cache_data`` keyword arguments starting with an underscore (helpers such
+as a prebuilt filter index) are left out of the key.
+"""
+import functools
+import threading
+from collections import OrderedDict
+
+
+def versioned_lru(maxsize: int = 128):
+    """Memoizing f(data, version, *args, **kwargs) on everything but data and _kwargs.
+
+    The least recently used entry is evicted once maxsize results are held.
+    Results are shared between callers and must be treated as read-only.
+    """
+    def decorator(func):
+        entries = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(data, version, *args, **kwargs):
+            key = (version, args, tuple(sorted(
+                (name, value) for name, value in kwargs.items() if not name.startswith("_")
+            )))
+            with lock:
+                if key in entries:
+                    entries.move_to_end(key)
+                    return entries[key]
+            result = func(data, version, *args, **kwargs)
+            with lock:
+                entries[key] = result
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return result
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_len = lambda: len(entries)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,66 @@
+"""Delay cause breakdowns as one vectorized reduction.
+
+The engine sums the frame once per (airport, carrier, year, month) cell into
+one contiguous float matrix: arriving flights, delayed flights, the five
+cause counts and the five cause delay minutes. A selection is a boolean mask
+over the cells built from per-key lookup tables, and its totals are a single
+``mask @ matrix`` product, so no rerun regroups or rescans the rows.
+"""
+import numpy as np
+import pandas as pd
+
+from delays.lookups import CAUSE_COLUMNS
+
+MINUTE_COLUMNS = ["carrier_delay", "weather_delay", "nas_delay", "security_delay", "late_aircraft_delay"]
+CAUSE_LABELS = ["Carrier", "Weather", "NAS", "Security", "Late Aircraft"]
+
+CELL_KEYS = ["airport_name_cleansed", "carrier_name", "year", "month"]
+TOTAL_COLUMNS = ["arr_flights", "arr_del15", *CAUSE_COLUMNS, *MINUTE_COLUMNS]
+
+
+class CauseEngine:
+    """Flight, cause count and cause minute totals per cell, reducible over any slice."""
+
+    def __init__(self, df: pd.DataFrame, keys: list = CELL_KEYS):
+        cells = df.groupby(keys, observed=True)[TOTAL_COLUMNS].sum()
+        self.matrix = np.ascontiguousarray(cells.to_numpy(np.float64))
+        self.codes = {}
+        self.lookup = {}
+        for level, key in enumerate(keys):
+            codes, uniques = pd.factorize(cells.index.get_level_values(level))
+            self.codes[key] = codes
+            self.lookup[key] = {value: code for code, value in enumerate(uniques.tolist())}
+
+    def mask(self, **criteria) -> np.ndarray:
+        """Cells matching every criterion; None or an empty list leaves a key unfiltered."""
+        mask = np.ones(len(self.matrix), dtype=bool)
+        for key, values in criteria.items():
+            if values is None:
+                continue
+            if isinstance(values, str) or not np.iterable(values):
+                values = [values]
+            if len(values) == 0:
+                continue
+            lookup = self.lookup[key]
+            allowed = np.zeros(len(lookup), dtype=bool)
+            allowed[[lookup[v] for v in values if v in lookup]] = True
+            mask &= allowed[self.codes[key]]
+        return mask
+
+    def totals(self, **criteria) -> pd.Series:
+        """Every total column summed over the selected cells."""
+        return pd.Series(self.mask(**criteria).astype(np.float64) @ self.matrix, index=TOTAL_COLUMNS)
+
+    def breakdown(self, **criteria) -> pd.DataFrame:
+        """Per cause: count_share (cause count per arriving flight) and minute_share
+        (share of all cause delay minutes, 0 when there are none). Empty when no
+        flights are selected.
+        """
+        totals = self.totals(**criteria)
+        flights, minutes = totals["arr_flights"], totals[MINUTE_COLUMNS].sum()
+        if flights <= 0:
+            return pd.DataFrame(columns=["count_share", "minute_share"], dtype=np.float64)
+        return pd.DataFrame({
+            "count_share": totals[CAUSE_COLUMNS].to_numpy() / flights,
+            "minute_share": totals[MINUTE_COLUMNS].to_numpy() / minutes if minutes > 0 else 0.0,
+        }, index=CAUSE_LABELS)
@@ -0,0 +1,103 @@
+"""Pre-aggregated cube behind the Delay Trends tab.
+
+The trend lines and KPIs are means of the per-row ``avg_delay_min`` and
+``delay_rate``, so the cube keeps their sums and non-null counts, which add up
+across any slice. Next to the base (carrier, airport) cube it keeps roll-ups by
+carrier, by airport and by date; every roll-up is keyed by season and date and
+sorted, so a query only touches the selected entities.
+"""
+import pandas as pd
+
+MEASURES = ["avg_delay_min", "delay_rate"]
+
+KEYS = ["carrier_name", "airport_code", "season", "date"]
+
+
+def cube_partial(df: pd.DataFrame) -> pd.DataFrame:
+    """Sums and non-null counts of the measures per cube key, as a flat frame.
+
+    Partials of disjoint row sets (e.g. one per store partition) combine into
+    the cube of their union by concatenation.
+    """
+    aggs = {}
+    for m in MEASURES:
+        aggs[f"{m}_sum"] = (m, "sum")
+        aggs[f"{m}_n"] = (m, "count")
+    return df.groupby(KEYS, observed=True).agg(**aggs).reset_index()
+
+
+class TrendCube:
+    """Sums and counts of the trend measures keyed by carrier, airport, season and date."""
+
+    def __init__(self, partials: pd.DataFrame):
+        self.base = partials.groupby(KEYS, observed=True).sum().sort_index()
+        self.by_carrier = self._rollup(["carrier_name", "season", "date"])
+        self.by_airport = self._rollup(["airport_code", "season", "date"])
+        self.by_date = self._rollup(["season", "date"])
+
+        self.seasons = self.by_date.index.unique("season").tolist()
+        self.carriers = self.by_carrier.index.unique("carrier_name").tolist()
+        self.airports = self.by_airport.index.unique("airport_code").tolist()
+        self.known = {"season": set(self.seasons), "carrier_name": set(self.carriers),
+                      "airport_code": set(self.airports)}
+
+    @classmethod
+    def from_rows(cls, df: pd.DataFrame) -> "TrendCube":
+        return cls(cube_partial(df))
+
+    def _rollup(self, keys: list) -> pd.DataFrame:
+        return self.base.groupby(level=keys, observed=True).sum().sort_index()
+
+    def select(self, season: str | None = None, carriers: list = (),
+               airports: list = ()) -> pd.DataFrame:
+        """Slicing the smallest roll-up that still answers the selection.
+
+        Values the cube has never seen are ignored, as in the other engines;
+        a list left with none of its values selects nothing.
+        """
+        seasons = slice(None) if season is None else self._known("season", [season])
+        carriers = self._known("carrier_name", carriers)
+        airports = self._known("airport_code", airports)
+        if carriers is not None and airports is not None:
+            key = (carriers, airports, seasons, slice(None))
+            cube = self.base
+        elif carriers is not None:
+            key = (carriers, seasons, slice(None))
+            cube = self.by_carrier
+        elif airports is not None:
+            key = (airports, seasons, slice(None))
+            cube = self.by_airport
+        else:
+            key = (seasons, slice(None))
+            cube = self.by_date
+        if any(isinstance(values, list) and not values for values in key):
+            return cube.iloc[:0]
+        try:
+            return cube.iloc[cube.index.get_locs(key)]
+        except KeyError:
+            # No row has every selected level value, e.g. a carrier that never served the airport.
+            return cube.iloc[:0]
+
+    def _known(self, level: str, values) -> list | None:
+        """The values the cube has seen, None when values filter nothing."""
+        if not len(values):
+            return None
+        return [v for v in values if v in self.known[level]]
+
+    def trend(self, measure: str, season: str | None = None, carriers: list = (),
+              airports: list = (), by: str | None = None) -> pd.DataFrame:
+        """Mean of measure per date (and per by), as the raw-row groupby would give."""
+        rows = self.select(season, carriers, airports)
+        keys = ["date"] if by is None else ["date", by]
+        sums = rows.groupby(level=keys, observed=True)[[f"{measure}_sum", f"{measure}_n"]].sum()
+        out = (sums[f"{measure}_sum"] / sums[f"{measure}_n"]).rename(measure)
+        return out.reset_index().sort_values("date")
+
+    def kpis(self, season: str | None = None, carriers: list = (),
+             airports: list = ()) -> dict:
+        """Overall means of every measure over the selection, 0 when nothing matches."""
+        rows = self.select(season, carriers, airports)
+        if rows.empty:
+            return {m: 0 for m in MEASURES}
+        totals = rows.sum()
+        return {m: totals[f"{m}_sum"] / totals[f"{m}_n"] for m in MEASURES}
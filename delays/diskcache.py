@@ -0,0 +1,152 @@
+"""Disk cache for query engines and results, so a restarted server starts warm.
+
+Entries live under ``data/cache/`` (or ``$DELAYS_CACHE_DIR``; set it to an
+empty string to disable the cache). They are keyed by a content hash of the
+store (see ``store.content_hash``) plus a hash of this package's code and the
+pandas, NumPy and pyarrow versions, so a new dataset, a code change or a
+library upgrade never reads stale entries, while a restart or a rebuild of
+identical data reuses them. Values are pickled with protocol 5, which writes
+NumPy and pandas buffers as raw bytes; an entry that still fails to load is
+logged, deleted and rebuilt like any miss. Once the cache exceeds
+``$DELAYS_CACHE_MAX_BYTES`` (1 GiB by default), the least recently used
+entries are deleted; the size is checked on a process's first write and then
+after every sixteenth of that size written.
+"""
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from delays.store import ROOT
+
+CACHE_DIR = os.environ.get("DELAYS_CACHE_DIR", str(ROOT / "data" / "cache"))
+MAX_BYTES = int(os.environ.get("DELAYS_CACHE_MAX_BYTES", 1 << 30))
+
+_log = logging.getLogger(__name__)
+# Guards _unscanned and eviction scans across threads.
+_lock = threading.Lock()
+# Bytes written since the last eviction scan; starting full makes a process scan on its first write.
+_unscanned = MAX_BYTES
+
+
+def _code_version() -> str:
+    digest = hashlib.sha256()
+    for source in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source.name.encode() + b"\0" + source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = _code_version()
+# Pickles of library objects may not load, or load wrong, under another version of the library.
+LIBRARY_VERSIONS = (pd.__version__, np.__version__, pa.__version__)
+
+
+def cache_key(*parts) -> str:
+    """A file-safe key for parts (strings, numbers, None and tuples of them), the code and library versions."""
+    return hashlib.sha256(pickle.dumps((CODE_VERSION, LIBRARY_VERSIONS, parts), protocol=5)).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return Path(CACHE_DIR) / key[:2] / f"{key}.pkl"
+
+
+def load(key: str) -> tuple:
+    """(True, value) for a cached key, else (False, None)."""
+    if not CACHE_DIR:
+        return False, None
+    path = _entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        # Missing, or evicted while opening.
+        return False, None
+    except Exception as exc:
+        # Cut short by a crash mid-write, or referring to code this process cannot load.
+        _log.warning("Dropping unreadable cache entry %s: %r", path, exc)
+        path.unlink(missing_ok=True)
+        return False, None
+    try:
+        # The modification time doubles as the last use, for eviction.
+        os.utime(path)
+    except OSError:
+        # Evicted since it was read; the value is still good.
+        pass
+    return True, value
+
+
+def store(key: str, value) -> None:
+    """Writing value atomically; the cache is scanned for eviction every MAX_BYTES / 16 written."""
+    global _unscanned
+    if not CACHE_DIR:
+        return
+    path = _entry_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(value, f, protocol=5)
+        size = f.tell()
+    os.replace(tmp, path)
+    with _lock:
+        _unscanned += size
+        scan = _unscanned >= MAX_BYTES // 16
+        if scan:
+            _unscanned = 0
+    if scan:
+        evict()
+
+
+def evict(max_bytes: int | None = None) -> int:
+    """Deleting least recently used entries until the cache fits max_bytes; returns bytes freed."""
+    if not CACHE_DIR:
+        return 0
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    with _lock:
+        entries = []
+        for path in Path(CACHE_DIR).glob("*/*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            freed += size
+    return freed
+
+
+def cached(key: str, build):
+    """The cached value for key, building and storing it with build() on a miss."""
+    hit, value = load(key)
+    if not hit:
+        value = build()
+        store(key, value)
+    return value
+
+
+def disk_cached(name: str):
+    """Persisting f(data, key, *args, **kwargs) on name, key and everything but data and _kwargs.
+
+    Like versioned_lru, which is meant to sit on top of it as the in-memory tier.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(data, key, *args, **kwargs):
+            public = tuple(sorted((k, v) for k, v in kwargs.items() if not k.startswith("_")))
+            return cached(cache_key(name, key, args, public), lambda: func(data, key, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
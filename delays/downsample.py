@@ -0,0 +1,60 @@
+"""Capping the points per series sent to the browser.
+
+Largest-Triangle-Three-Buckets keeps the first and last point of a series and,
+from each of the buckets in between, the point forming the largest triangle
+with the previously kept point and the average of the next bucket, so peaks
+and dips survive while flat stretches are thinned out.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = 500
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the n_out points LTTB keeps from x-sorted x, y."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype(np.int64)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+
+    # Bucket i (0 .. n_out - 3) covers edges[i]:edges[i + 1]; the last edge is the final point.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    with warnings.catch_warnings():
+        # All-NaN buckets average to NaN; their points just never win.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for i in range(n_out - 2):
+            lo, hi = edges[i], edges[i + 1]
+            next_hi = edges[i + 2] if i + 2 < len(edges) else n
+            avg_x, avg_y = x[hi:next_hi].mean(), np.nanmean(y[hi:next_hi])
+            area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+            a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+            keep[i + 1] = a
+    return keep
+
+
+def downsample(df: pd.DataFrame, x: str, y: str, by: str | None = None,
+               max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """At most max_points rows per series (per value of by), in the original row order.
+
+    df must be sorted by x within each series; frames already under the cap
+    are returned as is.
+    """
+    if by is None:
+        series = {None: np.arange(len(df))}
+    else:
+        series = df.groupby(by, observed=True).indices
+    if all(len(pos) <= max_points for pos in series.values()):
+        return df
+
+    xs, ys = df[x].to_numpy(), df[y].to_numpy()
+    keep = [pos[lttb(xs[pos], ys[pos], max_points)] for pos in series.values()]
+    return df.take(np.sort(np.concatenate(keep)))
@@ -0,0 +1,72 @@
+"""Paginated table for the filtered rows sections.
+
+``st.dataframe`` on a whole filtered frame serializes every row to the browser
+on every rerun. :func:`paged_dataframe` sends one page instead: the selection
+is kept as row positions (as returned by ``FilterIndex.select``), sorting
+touches only the sort column of the selected rows, and only the chosen
+columns of the visible rows are gathered.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+def sort_key(values: pd.Series) -> np.ndarray:
+    """Float sort key for any column; missing values become NaN so they sort last."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Rank categories by value, since their stored order is not necessarily sorted.
+        categories = values.cat.categories
+        rank = np.empty(len(categories) + 1)
+        rank[np.argsort(categories.to_numpy(), kind="stable")] = np.arange(len(categories))
+        rank[-1] = np.nan
+        return rank[values.cat.codes.to_numpy()]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        key = values.to_numpy("datetime64[ns]").astype(np.int64).astype(np.float64)
+        key[values.isna().to_numpy()] = np.nan
+        return key
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(np.float64, na_value=np.nan)
+    codes, _ = pd.factorize(values, sort=True)
+    key = codes.astype(np.float64)
+    key[codes < 0] = np.nan
+    return key
+
+
+def page_positions(df: pd.DataFrame, rows: np.ndarray | None, page: int, page_size: int,
+                   sort_by: str | None = None, ascending: bool = True) -> np.ndarray:
+    """Positions in df of page (0-based) of the selected rows, optionally sorted by sort_by.
+
+    rows None means every row, as with FilterIndex.take.
+    """
+    total = len(df) if rows is None else len(rows)
+    start, stop = page * page_size, min((page + 1) * page_size, total)
+    if sort_by is None:
+        return np.arange(start, stop) if rows is None else rows[start:stop]
+
+    column = df[sort_by] if rows is None else df[sort_by].take(rows)
+    key = sort_key(column)
+    order = np.argsort(key if ascending else -key, kind="stable")[start:stop]
+    return order if rows is None else rows[order]
+
+
+def paged_dataframe(df: pd.DataFrame, rows: np.ndarray | None = None, columns: list | None = None,
+                    key: str = "grid", page_size: int = 50, **kwargs) -> None:
+    """Rendering one page of df's selected rows with column, sort and page controls."""
+    columns = list(df.columns) if columns is None else columns
+    total = len(df) if rows is None else len(rows)
+
+    with st.expander("Columns and sorting"):
+        shown = st.multiselect("Columns", columns, default=columns, key=f"{key}_columns") or columns
+        left, right = st.columns([3, 1])
+        sort_by = left.selectbox("Sort by", [None, *columns], key=f"{key}_sort",
+                                 format_func=lambda c: "Original order" if c is None else c)
+        descending = right.toggle("Descending", key=f"{key}_descending")
+
+    pages = max(1, -(-total // page_size))
+    left, right = st.columns([1, 3])
+    page = left.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    right.caption(f"Rows {min(start + 1, total):,}–{min(start + page_size, total):,} of {total:,}")
+
+    positions = page_positions(df, rows, page - 1, page_size, sort_by, not descending)
+    st.dataframe(df[shown].take(positions), **kwargs)
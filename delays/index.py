@@ -0,0 +1,94 @@
+"""Inverted index for the dashboards' categorical filters.
+
+For each indexed column the index keeps every row's value code plus the row
+positions of each value, grouped and sorted. A selection starts from the
+positions of its most selective criterion and narrows them with code lookups
+on the remaining columns, so a filter touches only candidate rows instead of
+scanning every row and every string.
+"""
+import numpy as np
+import pandas as pd
+
+INDEX_COLUMNS = ["carrier_name", "airport_code", "airport_label", "season", "month", "year"]
+
+
+class FilterIndex:
+    """Per-value row positions for the filter columns of one dataset."""
+
+    def __init__(self, df: pd.DataFrame, columns: list = INDEX_COLUMNS):
+        self.n_rows = len(df)
+        self.codes = {}
+        self.values = {}
+        self.lookup = {}
+        self.offsets = {}
+        self.order = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col], sort=True)
+            order = np.argsort(codes, kind="stable")
+            self.codes[col] = codes
+            self.values[col] = pd.Index(uniques.tolist(), dtype=object)
+            self.lookup[col] = {value: code for code, value in enumerate(uniques.tolist())}
+            self.offsets[col] = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self.order[col] = order
+
+    def _value_codes(self, col: str, values) -> np.ndarray:
+        lookup = self.lookup[col]
+        codes = [lookup[v] for v in values if v in lookup]
+        return np.array(codes, dtype=np.intp)
+
+    def _rows(self, col: str, codes: np.ndarray) -> np.ndarray:
+        offsets, order = self.offsets[col], self.order[col]
+        parts = [order[offsets[c]:offsets[c + 1]] for c in codes]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def _count(self, col: str, codes: np.ndarray) -> int:
+        offsets = self.offsets[col]
+        return int((offsets[codes + 1] - offsets[codes]).sum())
+
+    def rows(self, col: str, values) -> np.ndarray:
+        """Sorted positions of the rows whose col is one of values."""
+        return self._rows(col, self._value_codes(col, values))
+
+    def count(self, col: str, values) -> int:
+        """Number of rows whose col is one of values, without touching the rows."""
+        return self._count(col, self._value_codes(col, values))
+
+    def select(self, **criteria) -> np.ndarray | None:
+        """Sorted positions of the rows matching every criterion, or None for all rows.
+
+        Each criterion is a column name mapped to one value or a list of values;
+        None, empty lists and lists covering every row mean "no filter" on that
+        column, so an unfiltered selection never gathers a copy of the frame.
+        """
+        active = {}
+        for col, values in criteria.items():
+            if values is None:
+                continue
+            if isinstance(values, str) or not np.iterable(values):
+                values = [values]
+            if len(values) == 0:
+                continue
+            codes = self._value_codes(col, values)
+            n = self._count(col, codes)
+            if n < self.n_rows:
+                active[col] = (n, codes)
+        if not active:
+            return None
+
+        first = min(active, key=lambda col: active[col][0])
+        rows = self._rows(first, active.pop(first)[1])
+        for col, (_, codes) in active.items():
+            # One spare slot so the -1 code of missing values looks up False.
+            allowed = np.zeros(len(self.values[col]) + 1, dtype=bool)
+            allowed[codes] = True
+            rows = rows[allowed[self.codes[col][rows]]]
+        return rows
+
+    @staticmethod
+    def take(df: pd.DataFrame, rows: np.ndarray | None) -> pd.DataFrame:
+        """Gathering only the selected rows; None returns the frame untouched."""
+        return df if rows is None else df.take(rows)
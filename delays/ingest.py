@@ -0,0 +1,75 @@
+"""Incremental ingestion of monthly BTS extracts into the data store.
+
+Each month in an extract becomes (or replaces) one store partition with its
+derived columns and pre-aggregates; every other partition is left as is.
+The dataset version is bumped, so the apps reload the data once on their next
+rerun instead of rebuilding from the CSVs.
+
+    python -m delays.ingest Airline_Delay_Cause_2024_06.csv [more.csv ...]
+"""
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from delays.store import STORE_PATH, read_store, store_version, write_partitions
+
+# BTS column names that the dashboards renamed (see condensed_data.ipynb).
+BTS_RENAMES = {"airport": "airport_code", "airport_name": "airport_full_name"}
+
+# Column layout of the CSV exports, so ingested partitions share their schema.
+SOURCE_COLUMNS = [
+    "year_month", "year", "month", "carrier", "carrier_name", "airport_code", "city", "state",
+    "airport_full_name", "airport_name_cleansed", "arr_flights", "arr_del15", "carrier_ct",
+    "weather_ct", "nas_ct", "security_ct", "late_aircraft_ct", "arr_cancelled", "arr_diverted",
+    "arr_delay", "carrier_delay", "weather_delay", "nas_delay", "security_delay", "late_aircraft_delay",
+]
+
+# "Atlanta, GA: Hartsfield-Jackson Atlanta International"
+AIRPORT_NAME_PATTERN = r"^(?P<city>.*), (?P<state>[A-Z]{2}): (?P<airport_name_cleansed>.*)$"
+
+
+def normalize_extract(df: pd.DataFrame) -> pd.DataFrame:
+    """Bringing a raw BTS extract to the store's columns."""
+    df = df.rename(columns=BTS_RENAMES)
+    if "year_month" not in df.columns:
+        df["year_month"] = pd.to_datetime(
+            {"year": df["year"], "month": df["month"], "day": 1}
+        ).dt.strftime("%Y-%m-%d")
+    missing = [c for c in ["city", "state", "airport_name_cleansed"] if c not in df.columns]
+    if missing:
+        parts = df["airport_full_name"].str.extract(AIRPORT_NAME_PATTERN)
+        df[missing] = parts[missing]
+    return df[SOURCE_COLUMNS]
+
+
+def flag_reduced(df: pd.DataFrame, path: Path = STORE_PATH) -> pd.DataFrame:
+    """Marking rows of the carriers and airports the reduced dashboards already show."""
+    reduced = read_store(["carrier", "airport_code"], filters=[("reduced", "==", True)], path=path)
+    df["reduced"] = (
+        df["carrier"].isin(reduced["carrier"].unique())
+        & df["airport_code"].isin(reduced["airport_code"].unique())
+    )
+    return df
+
+
+def ingest(paths: list, path: Path = STORE_PATH, workers: int = 1) -> list:
+    """Writing every month found in the extracts at paths; returns the year_months written."""
+    df = pd.concat([normalize_extract(pd.read_csv(p)) for p in paths], ignore_index=True)
+    return write_partitions(flag_reduced(df, path), path, workers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Add monthly BTS extracts to the data store.")
+    parser.add_argument("extracts", nargs="+", type=Path)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes writing partitions in parallel (default: 1)")
+    args = parser.parse_args()
+
+    written = ingest(args.extracts, workers=args.workers)
+    print(f"Wrote {len(written)} partition(s): {', '.join(written)}")
+    print(f"Store version {store_version()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Lookups behind the Delay Causes tab.
+
+Every function takes the (2014-2019) causes frame. They are not cached here:
+``delays.queries`` memoizes their results per store content and arguments, in
+memory and on disk, so each ranking and airline list is computed once per
+dataset instead of once per click.
+"""
+import pandas as pd
+
+from delays.index import FilterIndex
+
+CAUSE_COLUMNS = ["carrier_ct", "weather_ct", "nas_ct", "security_ct", "late_aircraft_ct"]
+
+MIN_FLIGHTS = 100_000
+
+
+def top_risky_airports(df: pd.DataFrame, min_flights: int = MIN_FLIGHTS, n: int = 10) -> tuple:
+    """Airports with at least min_flights arrivals, highest share of delayed flights first."""
+    airport_risk = df.groupby("airport_name_cleansed", observed=True).agg(
+        total_flights=("arr_flights", "sum"),
+        total_delays=("arr_del15", "sum")
+    )
+    airport_risk = airport_risk[airport_risk['total_flights'] >= min_flights]
+    airport_risk['delay_pct'] = airport_risk['total_delays'] / airport_risk['total_flights']
+    return tuple(airport_risk.sort_values('delay_pct', ascending=False).head(n).index)
+
+
+def airport_carriers(df: pd.DataFrame, airport: str | None = None, index: FilterIndex | None = None) -> tuple:
+    """Sorted carriers serving airport, or every carrier when airport is None."""
+    index = FilterIndex(df, ["airport_name_cleansed"]) if index is None else index
+    rows = index.select(airport_name_cleansed=airport)
+    carriers = df["carrier_name"] if rows is None else df["carrier_name"].take(rows)
+    return tuple(sorted(carriers.dropna().unique()))
@@ -0,0 +1,118 @@
+"""Timing spans for dashboard reruns.
+
+An app opens a :class:`RerunProfile` at the top of each rerun, wraps its
+stages (load, filter, groupby, figure build, chart/table serialization) in
+``profile.span(...)`` and calls ``finish()`` at the end. Spans are cheap
+enough to be always on; what they feed is opt-in:
+
+- the app can show the current rerun's spans in a debug panel;
+- with ``$DELAYS_PROFILE_DIR`` set, every rerun is appended to
+  ``reruns.jsonl`` there, and ``metrics-<pid>.prom`` is rewritten with the
+  process's per-stage totals in Prometheus text format.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_DIR = os.environ.get("DELAYS_PROFILE_DIR")
+
+# (app, stage) -> [reruns, total seconds, max seconds, total rows], for the whole process
+_totals = {}
+_lock = threading.Lock()
+
+
+class Span:
+    """One timed stage; rows may be set inside the with block."""
+
+    __slots__ = ("name", "seconds", "rows")
+
+    def __init__(self, name: str, rows: int | None = None):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = rows
+
+
+class RerunProfile:
+    """The spans of one rerun of one app."""
+
+    def __init__(self, app: str, session: str | None = None):
+        self.app = app
+        self.session = session
+        self.spans = []
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.total = None
+
+    @contextmanager
+    def span(self, name: str, rows: int | None = None):
+        span = Span(name, rows)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.seconds = time.perf_counter() - start
+            self.spans.append(span)
+
+    def rows(self) -> list:
+        """The spans as records for a table, in the order they finished."""
+        return [{"stage": s.name, "ms": s.seconds * 1e3, "rows": s.rows} for s in self.spans]
+
+    def finish(self) -> float:
+        """Closing the rerun: recording its spans and writing the exports if enabled."""
+        self.total = time.perf_counter() - self._start
+        stages = [(s.name, s.seconds, s.rows or 0) for s in self.spans] + [("rerun", self.total, 0)]
+        with _lock:
+            for name, seconds, rows in stages:
+                entry = _totals.setdefault((self.app, name), [0, 0.0, 0.0, 0])
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+                entry[3] += rows
+            if PROFILE_DIR:
+                _export(self, Path(PROFILE_DIR))
+        return self.total
+
+
+def prometheus_text() -> str:
+    """Per-stage totals of this process in Prometheus text exposition format."""
+    lines = [
+        "# HELP dashboard_stage_seconds Time spent in each stage of a dashboard rerun.",
+        "# TYPE dashboard_stage_seconds summary",
+    ]
+    for (app, stage), (count, total, _, _) in sorted(_totals.items()):
+        labels = f'app="{app}",stage="{stage}"'
+        lines.append(f"dashboard_stage_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"dashboard_stage_seconds_count{{{labels}}} {count}")
+    lines += [
+        "# HELP dashboard_stage_max_seconds Slowest run of each stage.",
+        "# TYPE dashboard_stage_max_seconds gauge",
+    ]
+    lines += [f'dashboard_stage_max_seconds{{app="{a}",stage="{s}"}} {v[2]:.6f}' for (a, s), v in sorted(_totals.items())]
+    lines += [
+        "# HELP dashboard_stage_rows_total Rows processed by each stage.",
+        "# TYPE dashboard_stage_rows_total counter",
+    ]
+    lines += [f'dashboard_stage_rows_total{{app="{a}",stage="{s}"}} {v[3]}' for (a, s), v in sorted(_totals.items())]
+    return "\n".join(lines) + "\n"
+
+
+def _export(profile: RerunProfile, directory: Path) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    record = {
+        "ts": profile.started,
+        "app": profile.app,
+        "session": profile.session,
+        "pid": os.getpid(),
+        "total_ms": profile.total * 1e3,
+        "spans": profile.rows(),
+    }
+    with open(directory / "reruns.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    # One metrics file per process, replaced atomically so scrapers never see half of it.
+    target = directory / f"metrics-{os.getpid()}.prom"
+    tmp = target.with_suffix(".tmp")
+    tmp.write_text(prometheus_text())
+    os.replace(tmp, target)
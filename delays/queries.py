@@ -0,0 +1,330 @@
+"""Headless queries behind the dashboards.
+
+Every number the dashboards show is answered here as plain Python, without
+Streamlit: delay trends and KPIs, the airport risk ranking, cause breakdowns,
+and the Airport Analysis metrics and medians. Each query takes filter values
+and returns a small frame, series, tuple or dict, so batch reports and other
+tools get the same numbers as the pages:
+
+    from delays import queries
+    queries.trends("delay_rate", season="Winter", carriers=["Delta Air Lines Inc."])
+    queries.cause_breakdown(airport="Chicago O'Hare", season="Summer")
+
+The engines behind the queries (trend cube, filter indexes, presorted delays,
+cause matrix) are built on first use once per store version by
+:func:`dataset`, over rows memory-mapped from shared memory. Engines and
+results are memoized per store content and filters, in memory and on disk
+(see ``delays.diskcache``), so repeated queries are dictionary lookups and a
+restarted server starts warm; like the rest of the cached data they are
+shared and read-only.
+
+Run ``python -m delays.queries`` after a deploy or data update to prepare the
+snapshot workers start from: the store, its rows in shared memory and every
+engine in the disk cache.
+"""
+import argparse
+import functools
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from delays.cache import versioned_lru
+from delays.causes import MINUTE_COLUMNS, CauseEngine
+from delays.cube import TrendCube
+from delays.diskcache import cache_key, cached, disk_cached
+from delays.index import FilterIndex
+from delays.lookups import MIN_FLIGHTS, airport_carriers, top_risky_airports
+from delays.quantiles import QuantileStore
+from delays.shared import CAUSE_YEARS, read_shared
+from delays.store import STORE_PATH, content_hash, ensure_store, manifest_version, read_aggregates, store_manifest
+from delays.timeindex import ADDITIVE_COLUMNS, TimeIndex
+from delays.transforms import SEASON_MONTHS
+from delays.views import View
+
+AIRPORT_VIEW_COLUMNS = [
+    "year_month", "year", "month", "carrier", "carrier_name", "airport_code", "city", "state",
+    "airport_full_name", "airport_name_cleansed", "arr_flights", "arr_del15", "carrier_ct",
+    "weather_ct", "nas_ct", "security_ct", "late_aircraft_ct", "arr_cancelled", "arr_diverted",
+    "arr_delay", "carrier_delay", "weather_delay", "nas_delay", "security_delay", "late_aircraft_delay",
+]
+CAUSE_VIEW_COLUMNS = [
+    "year", "month", "carrier_name", "airport_name_cleansed", "arr_flights", "arr_del15",
+    "carrier_ct", "weather_ct", "nas_ct", "security_ct", "late_aircraft_ct", *MINUTE_COLUMNS,
+]
+# Per-row indicators behind the Airport Analysis metrics, prefix-summed like the additive columns
+SUMMARY_COLUMNS = ["arr_delay_n", "delayed_rows"]
+
+AUTO = "auto"
+
+ENGINES = ["trend_cube", "airport_index", "airport_quantiles", "airport_time", "cause_index", "cause_engine"]
+
+
+def _built(method, persist: bool = False):
+    """A cached property that is built once even when sessions ask for it concurrently.
+
+    With persist, the value is also kept in the disk cache under the dataset's key.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def getter(self):
+        if name not in self.__dict__:
+            with self._lock:
+                if name not in self.__dict__:
+                    if persist:
+                        self.__dict__[name] = cached(cache_key(name, self.key), lambda: method(self))
+                    else:
+                        self.__dict__[name] = method(self)
+        return self.__dict__[name]
+
+    return property(getter)
+
+
+def _persisted(method):
+    return _built(method, persist=True)
+
+
+class Dataset:
+    """The store's rows and query engines for one store version, each built on first use.
+
+    Airport Analysis works on the reduced airports and carriers, Delay Causes
+    on the 2014-2019 rows and Delay Trends on the reduced rows too, through
+    the cube partials written with every partition.
+    version names the write (for shared memory); key names the contents, and
+    keys the engines and query results in memory and on disk.
+    """
+
+    def __init__(self, manifest: dict, path: Path = STORE_PATH):
+        self.path = path
+        self.version = manifest_version(manifest)
+        self.key = content_hash(manifest)
+        self._lock = threading.RLock()
+
+    @_built
+    def table(self) -> pd.DataFrame:
+        return read_shared("rows", self.version, path=self.path)
+
+    @_built
+    def airport_view(self) -> View:
+        return View(self.table, self.table["reduced"].to_numpy(), AIRPORT_VIEW_COLUMNS + ["airport_label"])
+
+    @_built
+    def cause_view(self) -> View:
+        return View(self.table, self.table["year"].between(*CAUSE_YEARS).to_numpy(), CAUSE_VIEW_COLUMNS)
+
+    @_persisted
+    def trend_cube(self) -> TrendCube:
+        # One dataset read of every partition's partial; per-file reads cost more than the cube itself.
+        return TrendCube(read_aggregates("trend_cube", path=self.path))
+
+    @_persisted
+    def airport_index(self) -> FilterIndex:
+        return FilterIndex(self.airport_view.frame)
+
+    @_persisted
+    def airport_quantiles(self) -> QuantileStore:
+        return QuantileStore(self.airport_view.frame)
+
+    @_persisted
+    def airport_time(self) -> TimeIndex:
+        frame = self.airport_view.frame
+        return TimeIndex(
+            frame.assign(arr_delay_n=frame["arr_delay"].notna(), delayed_rows=frame["arr_del15"].eq(1)),
+            [*ADDITIVE_COLUMNS, *SUMMARY_COLUMNS],
+        )
+
+    @_persisted
+    def cause_index(self) -> FilterIndex:
+        return FilterIndex(self.cause_view.frame, ["airport_name_cleansed"])
+
+    @_persisted
+    def cause_engine(self) -> CauseEngine:
+        return CauseEngine(self.cause_view.frame)
+
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+def dataset(path: Path = STORE_PATH) -> Dataset:
+    """The current store version's dataset; a new write replaces the previous one."""
+    manifest = store_manifest(path)
+    version = manifest_version(manifest)
+    with _datasets_lock:
+        data = _datasets.get(path)
+        if data is None or data.version != version:
+            data = _datasets[path] = Dataset(manifest, path)
+    return data
+
+
+def prepare(path: Path = STORE_PATH) -> Dataset:
+    """Building the store if needed, publishing its rows to shared memory and every engine to the disk cache."""
+    ensure_store(path)
+    data = dataset(path)
+    for engine in ENGINES:
+        getattr(data, engine)
+    return data
+
+
+def trend_group(carriers: list = (), airports: list = ()) -> str | None:
+    """The column trend lines are split by: carriers, else airports, when several are selected."""
+    if len(carriers) > 1:
+        return "carrier_name"
+    if len(airports) > 1:
+        return "airport_code"
+    return None
+
+
+@versioned_lru(maxsize=256)
+@disk_cached("trends")
+def _trends(data: Dataset, version: str, measure: str, season, carriers: tuple, airports: tuple,
+            by) -> pd.DataFrame:
+    return data.trend_cube.trend(measure, season, list(carriers), list(airports), by=by)
+
+
+def trends(measure: str, season: str | None = None, carriers: list = (), airports: list = (),
+           by: str | None = AUTO, path: Path = STORE_PATH) -> pd.DataFrame:
+    """Mean of measure ("avg_delay_min" or "delay_rate") per date, and per by if given.
+
+    By default the lines are split as the dashboards split them (see trend_group).
+    """
+    data = dataset(path)
+    if by == AUTO:
+        by = trend_group(carriers, airports)
+    return _trends(data, data.key, measure, season, tuple(sorted(carriers)), tuple(sorted(airports)), by)
+
+
+@versioned_lru(maxsize=256)
+@disk_cached("trend_kpis")
+def _trend_kpis(data: Dataset, version: str, season, carriers: tuple, airports: tuple) -> dict:
+    return data.trend_cube.kpis(season, list(carriers), list(airports))
+
+
+def trend_kpis(season: str | None = None, carriers: list = (), airports: list = (),
+               path: Path = STORE_PATH) -> dict:
+    """Average delay minutes and delay rate over the selection, 0 when nothing matches."""
+    data = dataset(path)
+    return _trend_kpis(data, data.key, season, tuple(sorted(carriers)), tuple(sorted(airports)))
+
+
+@versioned_lru(maxsize=16)
+@disk_cached("risky_airports")
+def _risky_airports(data: Dataset, version: str, min_flights: int, n: int) -> tuple:
+    return top_risky_airports(data.cause_view.frame, min_flights, n)
+
+
+def risky_airports(n: int = 10, min_flights: int = MIN_FLIGHTS, path: Path = STORE_PATH) -> tuple:
+    """The n airports (2014-2019, at least min_flights arrivals) with the highest share of delayed flights."""
+    data = dataset(path)
+    return _risky_airports(data, data.key, min_flights, n)
+
+
+@versioned_lru(maxsize=256)
+@disk_cached("cause_carriers")
+def _cause_carriers(data: Dataset, version: str, airport) -> tuple:
+    return airport_carriers(data.cause_view.frame, airport, data.cause_index)
+
+
+def cause_carriers(airport: str | None = None, path: Path = STORE_PATH) -> tuple:
+    """Sorted carriers serving airport in 2014-2019, or every carrier when airport is None."""
+    data = dataset(path)
+    return _cause_carriers(data, data.key, airport)
+
+
+@versioned_lru(maxsize=1024)
+@disk_cached("cause_breakdown")
+def _cause_breakdown(data: Dataset, version: str, airport, carrier, season) -> pd.DataFrame:
+    return data.cause_engine.breakdown(
+        airport_name_cleansed=airport,
+        carrier_name=carrier,
+        month=SEASON_MONTHS[season] if season else None,
+    )
+
+
+def cause_breakdown(airport: str | None = None, carrier: str | None = None, season: str | None = None,
+                    path: Path = STORE_PATH) -> pd.DataFrame:
+    """Per delay cause in 2014-2019: count_share (per arriving flight) and minute_share.
+
+    Empty when no flights are selected; see CauseEngine.breakdown.
+    """
+    data = dataset(path)
+    return _cause_breakdown(data, data.key, airport, carrier, season)
+
+
+def airport_criteria(carrier: str | None = None, airport: str | None = None,
+                     months: tuple = (1, 12)) -> dict:
+    """Airport Analysis filters as FilterIndex/QuantileStore criteria; airport is an airport_label."""
+    return {
+        "carrier_name": carrier,
+        "airport_label": airport,
+        "month": range(months[0], months[1] + 1),
+    }
+
+
+def airport_rows(carrier: str | None = None, airport: str | None = None, months: tuple = (1, 12),
+                 path: Path = STORE_PATH) -> np.ndarray | None:
+    """Positions of the selected rows in dataset().airport_view.frame, or None for all rows."""
+    return dataset(path).airport_index.select(**airport_criteria(carrier, airport, months))
+
+
+@versioned_lru(maxsize=1024)
+@disk_cached("airport_totals")
+def _airport_totals(data: Dataset, version: str, carrier, airport, months: tuple, period) -> pd.Series:
+    axis, (start, end) = ("year_month", period) if period else ("month", months)
+    return data.airport_time.totals(axis, start, end, carrier_name=carrier, airport_label=airport)
+
+
+def airport_totals(carrier: str | None = None, airport: str | None = None, months: tuple = (1, 12),
+                   period: tuple | None = None, path: Path = STORE_PATH) -> pd.Series:
+    """Row count and every additive column summed over the selection, from prefix sums.
+
+    months is a month-of-year range; period, a year_month range such as
+    ("2015-01-01", "2018-12-01"), replaces it when given.
+    """
+    data = dataset(path)
+    return _airport_totals(data, data.key, carrier, airport, tuple(months), period and tuple(period))
+
+
+def airport_summary(carrier: str | None = None, airport: str | None = None, months: tuple = (1, 12),
+                    period: tuple | None = None, path: Path = STORE_PATH) -> dict:
+    """Selected row count, mean arr_delay and share of rows with arr_del15 == 1 (NaN when empty)."""
+    totals = airport_totals(carrier, airport, months, period, path)
+    rows = int(totals["rows"])
+    if not rows:
+        return {"rows": 0, "avg_delay": np.nan, "delayed_share": np.nan}
+    return {
+        "rows": rows,
+        "avg_delay": totals["arr_delay"] / totals["arr_delay_n"] if totals["arr_delay_n"] else np.nan,
+        "delayed_share": totals["delayed_rows"] / rows,
+    }
+
+
+@versioned_lru(maxsize=256)
+@disk_cached("airport_medians")
+def _airport_medians(data: Dataset, version: str, carrier, airport, months: tuple, by: str) -> pd.Series:
+    return data.airport_quantiles.median(by=by, **airport_criteria(carrier, airport, months))
+
+
+def airport_medians(carrier: str | None = None, airport: str | None = None, months: tuple = (1, 12),
+                    by: str = "airport_code", path: Path = STORE_PATH) -> pd.Series:
+    """Median arr_delay of the selected rows per value of by, in by order."""
+    data = dataset(path)
+    return _airport_medians(data, data.key, carrier, airport, tuple(months), by)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prepare the store, shared rows and cached engines.")
+    parser.add_argument("--path", type=Path, default=STORE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = prepare(args.path)
+    print(f"Prepared {len(data.table):,} rows and {len(ENGINES)} engines of store {data.version} "
+          f"in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Streaming version of the reduction in nessa_files/condensed_data.ipynb.
+
+The notebook loads the whole source, keeps 2014-2021, the top 6 airports of
+each year by delayed flights and the first 5 carrier codes at those airports,
+and writes ``csv/delays_reduced.csv``. This script does the same in two passes
+over fixed-size chunks, so memory depends on the chunk size and the number of
+(year, airport, carrier) groups, not on the size of the source:
+
+1. read only the key and ``arr_del15`` columns and accumulate delayed
+   flights per year, airport and carrier;
+2. read every column again and append the selected rows to the output.
+
+The source can be ``delays_transformed.csv`` or a raw BTS export; raw column
+names and airport names are normalized like in ``delays.ingest``.
+
+    python -m delays.reduce Airline_Delay_Cause.csv --chunksize 250000
+
+``--rank-carriers`` keeps the 5 carriers with the most delayed flights instead,
+which selects different carriers than the shipped CSV.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from delays.ingest import BTS_RENAMES, normalize_extract
+from delays.store import CSV_DIR
+
+YEARS = (2014, 2021)
+AIRPORTS_PER_YEAR = 6
+CARRIERS = 5
+CHUNKSIZE = 500_000
+
+KEY_COLUMNS = ["year", "airport_code", "carrier"]
+
+
+def _key_columns(name: str) -> bool:
+    return BTS_RENAMES.get(name, name) in KEY_COLUMNS + ["arr_del15"]
+
+
+def _chunks(source: Path, chunksize: int, usecols=None):
+    """Chunks of the source within YEARS, with BTS columns renamed."""
+    for chunk in pd.read_csv(source, chunksize=chunksize, usecols=usecols):
+        chunk = chunk.rename(columns=BTS_RENAMES)
+        yield chunk[chunk["year"].between(*YEARS)]
+
+
+def delay_totals(source: Path, chunksize: int = CHUNKSIZE) -> pd.Series:
+    """First pass: delayed flights per year, airport and carrier."""
+    totals = None
+    for chunk in _chunks(source, chunksize, usecols=_key_columns):
+        sums = chunk.groupby(KEY_COLUMNS)["arr_del15"].sum()
+        totals = sums if totals is None else totals.add(sums, fill_value=0)
+    if totals is None:
+        return pd.Series(dtype=float, index=pd.MultiIndex.from_arrays([[], [], []], names=KEY_COLUMNS))
+    return totals
+
+
+def select_keys(totals: pd.Series, rank_carriers: bool = False) -> tuple:
+    """The notebook's top airports (per year) and carriers (at those airports).
+
+    Like the notebook's ``head(5)`` on unsorted sums, the carriers are the
+    first five codes in sorted order; with rank_carriers they are the five
+    with the most delayed flights, ties going to the first code.
+    """
+    by_year = totals.groupby(["year", "airport_code"]).sum().reset_index()
+    by_year = by_year.sort_values(["year", "arr_del15", "airport_code"], ascending=[True, False, True])
+    airports = by_year.groupby("year").head(AIRPORTS_PER_YEAR)["airport_code"].unique()
+
+    at_airports = totals[totals.index.get_level_values("airport_code").isin(airports)]
+    by_carrier = at_airports.groupby("carrier").sum().reset_index()
+    if rank_carriers:
+        by_carrier = by_carrier.sort_values(["arr_del15", "carrier"], ascending=[False, True])
+    carriers = by_carrier.head(CARRIERS)["carrier"]
+    return sorted(airports), sorted(carriers)
+
+
+def write_reduced(source: Path, output: Path, airports: list, carriers: list,
+                  chunksize: int = CHUNKSIZE) -> int:
+    """Second pass: appending the selected rows to output; returns the rows written."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(".tmp")
+    rows = 0
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(_chunks(source, chunksize)):
+            chunk = chunk[chunk["airport_code"].isin(airports) & chunk["carrier"].isin(carriers)]
+            normalize_extract(chunk).to_csv(f, index=False, header=i == 0)
+            rows += len(chunk)
+    os.replace(tmp, output)
+    return rows
+
+
+def reduce_source(source: Path, output: Path, chunksize: int = CHUNKSIZE, rank_carriers: bool = False) -> dict:
+    """Both passes; returns the selected airports and carriers and the rows written."""
+    airports, carriers = select_keys(delay_totals(source, chunksize), rank_carriers)
+    rows = write_reduced(source, output, airports, carriers, chunksize)
+    return {"airports": airports, "carriers": carriers, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reduce the delay source to the dashboards' subset.")
+    parser.add_argument("source", nargs="?", type=Path, default=CSV_DIR / "delays_transformed.csv")
+    parser.add_argument("--output", type=Path, default=CSV_DIR / "delays_reduced.csv")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--rank-carriers", action="store_true",
+                        help="keep the carriers with the most delays, not the notebook's first codes")
+    args = parser.parse_args()
+
+    result = reduce_source(args.source, args.output, args.chunksize, args.rank_carriers)
+    print(f"Airports: {', '.join(result['airports'])}")
+    print(f"Carriers: {', '.join(result['carriers'])}")
+    print(f"Wrote {result['rows']:,} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
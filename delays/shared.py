@@ -0,0 +1,154 @@
+"""Store tables shared read-only between dashboard processes.
+
+Each Streamlit server process used to read the store into its own heap. Here
+a table is written once per store version as an uncompressed Arrow IPC file
+in shared memory (``/dev/shm``, or ``$DELAYS_SHARED_DIR``) and every process
+memory-maps it, so the pages are held once per host. The loaders are
+projections: column selection is free, row filters whose matches form one
+contiguous range become zero-copy slices, and numeric columns reach pandas
+without a copy.
+
+File names carry a tag of the store's location, so stores of other
+checkouts on the same host keep their own tables.
+
+The row table is laid out so the dashboards' filters are contiguous: both the
+reduced rows (Airport Analysis) and the CAUSE_YEARS rows (Delay Causes) form
+one range each, so their views are zero-copy slices.
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from delays.store import STORE_PATH
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, a concurrent publish just writes twice
+    fcntl = None
+
+SHARED_DIR = Path(
+    os.environ.get("DELAYS_SHARED_DIR")
+    or ("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+)
+
+# The Delay Causes window
+CAUSE_YEARS = (2014, 2019)
+
+FILTER_OPS = {
+    "==": pc.equal,
+    "!=": pc.not_equal,
+    "<": pc.less,
+    "<=": pc.less_equal,
+    ">": pc.greater,
+    ">=": pc.greater_equal,
+}
+
+
+def _rows_table(path: Path) -> pa.Table:
+    table = pq.read_table(path)
+    reduced = table["reduced"].to_numpy()
+    window = pc.and_(pc.greater_equal(table["year"], CAUSE_YEARS[0]),
+                     pc.less_equal(table["year"], CAUSE_YEARS[1])).to_numpy()
+    # Other rows outside the window, other rows in it, reduced rows in it, reduced rows after it.
+    # Reduced rows never predate the window, so they also stay in month order.
+    layout = np.where(reduced, np.where(window, 2, 3), np.where(window, 1, 0))
+    return table.take(np.argsort(layout, kind="stable"))
+
+
+SOURCES = {
+    "rows": _rows_table,
+}
+
+
+def _prefix(name: str, path: Path) -> str:
+    """delays-<store tag>-<name>, the tag being a hash of the store's resolved location."""
+    tag = hashlib.sha256(str(Path(path).resolve()).encode()).hexdigest()[:8]
+    return f"delays-{tag}-{name}"
+
+
+def shared_path(name: str, version: str, path: Path = STORE_PATH) -> Path:
+    return SHARED_DIR / f"{_prefix(name, path)}-{version}.arrow"
+
+
+def _prepare(table: pa.Table) -> pa.Table:
+    """One chunk per column, one dictionary per column and NaN instead of float nulls.
+
+    NaN keeps float columns free of validity bitmaps, which pandas would
+    otherwise have to copy them to apply.
+    """
+    table = table.unify_dictionaries().combine_chunks()
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type) and table.column(i).null_count:
+            table = table.set_column(i, field, pc.fill_null(table.column(i), np.nan))
+    return table
+
+
+def publish(name: str, version: str, path: Path = STORE_PATH) -> Path:
+    """Writing table name of this store version to shared memory, once per host."""
+    target = shared_path(name, version, path)
+    prefix = _prefix(name, path)
+    SHARED_DIR.mkdir(parents=True, exist_ok=True)
+    with open(SHARED_DIR / f"{prefix}.lock", "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if not target.exists():
+            table = _prepare(SOURCES[name](path))
+            tmp = target.with_suffix(f".{os.getpid()}.tmp")
+            with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, target)
+            # Older versions of this store are unlinked; processes still mapping them keep their pages.
+            for old in SHARED_DIR.glob(f"{prefix}-*.arrow"):
+                if old != target:
+                    old.unlink(missing_ok=True)
+    return target
+
+
+def attach(name: str, version: str, path: Path = STORE_PATH) -> pa.Table:
+    """Memory-mapping the shared table, publishing it first if this host has none yet."""
+    target = shared_path(name, version, path)
+    try:
+        source = pa.memory_map(str(target))
+    except FileNotFoundError:
+        # Not published on this host yet, or unlinked by a concurrent publish of another version.
+        publish(name, version, path)
+        source = pa.memory_map(str(target))
+    return pa.ipc.open_file(source).read_all()
+
+
+def _mask(table: pa.Table, filters: list) -> np.ndarray:
+    mask = np.ones(table.num_rows, dtype=bool)
+    for col, op, value in filters:
+        column = table.column(col)
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        if op == "in":
+            matches = pc.is_in(column, value_set=pa.array(list(value)))
+        else:
+            matches = FILTER_OPS[op](column, value)
+        mask &= matches.to_numpy(zero_copy_only=False).astype(bool)
+    return mask
+
+
+def read_shared(name: str, version: str, columns: list | None = None, filters: list | None = None,
+                path: Path = STORE_PATH) -> pd.DataFrame:
+    """A projection of a shared table, like store.read_store(columns, filters) but zero-copy where possible.
+
+    filters is a list of (column, op, value) conditions that must all hold.
+    """
+    shared = attach(name, version, path)
+    table = shared if columns is None else shared.select(columns)
+    if filters:
+        rows = np.flatnonzero(_mask(shared, filters))
+        if len(rows) == 0 or rows[-1] - rows[0] + 1 == len(rows):
+            table = table.slice(rows[0] if len(rows) else 0, len(rows))
+        else:
+            table = table.take(rows)
+    return table.to_pandas(split_blocks=True)
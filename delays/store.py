@@ -0,0 +1,327 @@
+"""Columnar data store for the dashboards.
+
+The store is a Parquet dataset with one append-only partition per
+``year_month`` (``data/delays/year_month=2019-06-01/part-0.parquet``): typed,
+zstd-compressed, with categorical labels. Each partition carries its own
+derived columns and pre-aggregates (``_aggregates/<name>/``), and
+``_manifest.json`` records a version, content hash, source (``csv`` or
+``ingest``) and derivation code version per partition plus a dataset version
+that is bumped on every write.
+
+The CSV exports in ``csv/`` are written into it by :func:`build_store`; new
+monthly BTS extracts are added with ``python -m delays.ingest``. The apps read
+it with column projection and row filters instead of re-parsing text.
+
+Building is a deploy step, never done by readers: ``python -m delays.queries``
+builds a missing or stale store, re-derives ingested months written by older
+derivation code (and prepares the snapshot the dashboards start from), ``python -m delays.store [--workers N]`` rebuilds the CSV months
+unconditionally. Writers take the store's file lock, so concurrent builds and
+ingests take turns.
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from delays.aggregates import AGGREGATES
+from delays.transforms import DERIVED_COLUMNS, add_airport_label, add_derived_columns
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, concurrent writers are not serialized
+    fcntl = None
+
+ROOT = Path(__file__).resolve().parent.parent
+CSV_DIR = ROOT / "csv"
+STORE_PATH = ROOT / "data" / "delays"
+
+MANIFEST = "_manifest.json"
+LOCK = ".lock"
+AGGREGATES_DIR = "_aggregates"
+
+PARTITION_COLUMN = "year_month"
+KEY_COLUMNS = ["year_month", "carrier", "airport_code"]
+SORT_COLUMNS = ["carrier", "airport_code"]
+
+CATEGORICAL_COLUMNS = [
+    "carrier",
+    "carrier_name",
+    "airport_code",
+    "city",
+    "state",
+    "airport_full_name",
+    "airport_name_cleansed",
+    "season",
+    "airport_label",
+]
+
+INTEGER_DTYPES = {"year": "int16", "month": "int8"}
+
+# Fixed column types so every partition has the same schema regardless of its values.
+FLOAT_DTYPE = "float32"
+DICTIONARY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+ROW_GROUP_SIZE = 64_000
+
+# The code behind a partition's derived columns and pre-aggregates
+DERIVE_CODE = ["store.py", "transforms.py", "aggregates.py", "cube.py"]
+
+
+def _derive_version() -> str:
+    digest = hashlib.sha256()
+    for name in DERIVE_CODE:
+        digest.update(Path(__file__).with_name(name).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+DERIVE_VERSION = _derive_version()
+
+
+def _read_sources() -> pd.DataFrame:
+    """Reading the widest CSV available and flagging the reduced subset."""
+    reduced = pd.read_csv(CSV_DIR / "delays_reduced.csv")
+    full_path = CSV_DIR / "delays_transformed.csv"
+    if not full_path.exists():
+        reduced["reduced"] = True
+        return reduced
+
+    df = pd.read_csv(full_path)
+    df["reduced"] = pd.MultiIndex.from_frame(df[KEY_COLUMNS]).isin(
+        pd.MultiIndex.from_frame(reduced[KEY_COLUMNS])
+    )
+    return df
+
+
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrinking dtypes: categoricals for labels, small fixed ints/floats for numbers."""
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif col in INTEGER_DTYPES:
+            df[col] = df[col].astype(INTEGER_DTYPES[col])
+        elif pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].astype(FLOAT_DTYPE)
+    return df
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = pa.schema([
+        field.with_type(DICTIONARY_TYPE) if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ], metadata=table.schema.metadata)
+    return table.cast(schema)
+
+
+def _temp_file(path: Path):
+    # A unique name per writer; the leading dot keeps dataset readers from listing it.
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False)
+    # Temporary files are private to their owner, but the store is read by the dashboards' user too.
+    os.chmod(tmp.name, 0o644)
+    return tmp
+
+
+def _write_atomic(table: pa.Table, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _temp_file(path) as tmp:
+        pq.write_table(table, tmp, compression="zstd", row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp.name, path)
+
+
+@contextmanager
+def store_lock(path: Path = STORE_PATH):
+    """Holding the store's write lock, across threads and processes."""
+    path.mkdir(parents=True, exist_ok=True)
+    with open(path / LOCK, "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def partition_path(year_month: str, path: Path = STORE_PATH) -> Path:
+    return path / f"{PARTITION_COLUMN}={year_month}" / "part-0.parquet"
+
+
+def aggregate_path(name: str, year_month: str, path: Path = STORE_PATH) -> Path:
+    return path / AGGREGATES_DIR / name / f"{PARTITION_COLUMN}={year_month}.parquet"
+
+
+def read_manifest(path: Path = STORE_PATH) -> dict:
+    """The dataset version and per-partition versions and row counts."""
+    try:
+        return json.loads((path / MANIFEST).read_text())
+    except FileNotFoundError:
+        return {"version": 0, "write_id": "", "partitions": {}}
+
+
+def _write_manifest(manifest: dict, path: Path) -> None:
+    target = path / MANIFEST
+    with _temp_file(target) as tmp:
+        tmp.write(json.dumps(manifest, indent=1, sort_keys=True).encode())
+    os.replace(tmp.name, target)
+
+
+def _write_partition(year_month: str, part: pd.DataFrame, path: Path) -> tuple:
+    """Deriving, typing and writing one month with its pre-aggregates; returns its content hash too."""
+    part = part.drop(columns=PARTITION_COLUMN).sort_values(SORT_COLUMNS, ignore_index=True)
+    part = _downcast(add_airport_label(add_derived_columns(part)))
+    target = partition_path(year_month, path)
+    _write_atomic(_to_table(part), target)
+    for name, aggregate in AGGREGATES.items():
+        _write_atomic(_to_table(aggregate(part)), aggregate_path(name, year_month, path))
+    return year_month, len(part), hashlib.sha256(target.read_bytes()).hexdigest()
+
+
+def write_partitions(df: pd.DataFrame, path: Path = STORE_PATH, workers: int = 1,
+                     source: str = "ingest") -> list:
+    """Deriving, typing and writing each year_month of df as its own partition.
+
+    Partitions already in the store for those months are replaced; all others
+    are left untouched. With workers > 1 the months are written by a process
+    pool; the manifest is still updated here, in month order, so the result
+    does not depend on which worker finishes first. source is recorded per
+    partition ("csv" months are rebuilt from the CSVs, others re-derived from
+    their stored rows). Returns the year_months written.
+    """
+    with store_lock(path):
+        return _write_partitions(df, path, workers, source)
+
+
+def _write_partitions(df: pd.DataFrame, path: Path, workers: int, source: str) -> list:
+    groups = df.groupby(PARTITION_COLUMN, sort=True)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_write_partition, ym, part, path) for ym, part in groups]
+            results = [future.result() for future in futures]
+    else:
+        results = [_write_partition(ym, part, path) for ym, part in groups]
+
+    manifest = read_manifest(path)
+    # A fresh id per write keeps versions unique even if the store is deleted and rebuilt.
+    write_id = uuid.uuid4().hex[:12]
+    for year_month, rows, sha256 in sorted(results):
+        manifest["partitions"][year_month] = {
+            "version": write_id, "rows": rows, "sha256": sha256, "source": source, "derive": DERIVE_VERSION,
+        }
+    manifest["version"] += 1
+    manifest["write_id"] = write_id
+    _write_manifest(manifest, path)
+    return [year_month for year_month, _, _ in sorted(results)]
+
+
+def build_store(path: Path = STORE_PATH, workers: int = 1) -> Path:
+    """Parsing the CSVs once and writing their months into the store."""
+    with store_lock(path):
+        _write_partitions(_read_sources(), path, workers, "csv")
+    return path
+
+
+def ensure_store(path: Path = STORE_PATH, workers: int = 1) -> bool:
+    """Building the store if it is missing or stale and re-deriving outdated ingested months.
+
+    Returns whether anything was written.
+    """
+    with store_lock(path):
+        # Checked under the lock, so a build that just finished elsewhere is not repeated.
+        built = _is_stale(path)
+        if built:
+            _write_partitions(_read_sources(), path, workers, "csv")
+        months = _outdated_ingests(read_manifest(path))
+        if months:
+            _write_partitions(_stored_rows(months, path), path, workers, "ingest")
+    return built or bool(months)
+
+
+def _is_stale(path: Path) -> bool:
+    """Checking whether the store is missing, older than its CSVs or has CSV months derived by other code."""
+    manifest = path / MANIFEST
+    if not manifest.exists():
+        return True
+    if max(p.stat().st_mtime for p in CSV_DIR.glob("*.csv")) > manifest.stat().st_mtime:
+        return True
+    return any(
+        p.get("derive") != DERIVE_VERSION
+        for p in read_manifest(path)["partitions"].values() if p.get("source", "csv") == "csv"
+    )
+
+
+def _outdated_ingests(manifest: dict) -> list:
+    """Ingested months whose derived columns and pre-aggregates come from other code."""
+    return sorted(
+        year_month for year_month, p in manifest["partitions"].items()
+        if p.get("source", "csv") != "csv" and p.get("derive") != DERIVE_VERSION
+    )
+
+
+def _stored_rows(months: list, path: Path) -> pd.DataFrame:
+    """The stored source columns of months, for deriving them again."""
+    df = read_store(filters=[(PARTITION_COLUMN, "in", months)], path=path)
+    df = df.drop(columns=[c for c in DERIVED_COLUMNS if c in df.columns])
+    df[PARTITION_COLUMN] = df[PARTITION_COLUMN].astype(str)
+    return df
+
+
+def store_manifest(path: Path = STORE_PATH) -> dict:
+    """The manifest of a built store; raises FileNotFoundError if there is none."""
+    if not (path / MANIFEST).exists():
+        raise FileNotFoundError(f"No data store at {path}; build it with `python -m delays.queries`")
+    return read_manifest(path)
+
+
+def manifest_version(manifest: dict) -> str:
+    """A token that changes whenever any partition of the store is written."""
+    return f"v{manifest['version']}-{manifest['write_id']}"
+
+
+def content_hash(manifest: dict) -> str:
+    """A token of the store's contents: equal for stores holding the same partitions.
+
+    Unlike manifest_version it survives a rebuild that writes identical data,
+    so caches keyed by it stay valid across rebuilds and hosts.
+    """
+    digest = hashlib.sha256()
+    for year_month, partition in sorted(manifest["partitions"].items()):
+        digest.update(f"{year_month}:{partition.get('sha256', partition['version'])}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def store_version(path: Path = STORE_PATH) -> str:
+    """The current store's version token."""
+    return manifest_version(store_manifest(path))
+
+
+def read_store(columns: list | None = None, filters: list | None = None,
+               path: Path = STORE_PATH) -> pd.DataFrame:
+    """Reading only the requested columns and rows."""
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def read_aggregate(name: str, year_month: str, path: Path = STORE_PATH) -> pd.DataFrame:
+    """One partition's pre-aggregate, as written by write_partitions."""
+    return pd.read_parquet(aggregate_path(name, year_month, path))
+
+
+def read_aggregates(name: str, filters: list | None = None, path: Path = STORE_PATH) -> pd.DataFrame:
+    """Every partition's pre-aggregate concatenated in month order."""
+    return pd.read_parquet(path / AGGREGATES_DIR / name, filters=filters)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the data store from the CSVs.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes writing partitions in parallel (default: 1)")
+    args = parser.parse_args()
+    print(f"Wrote {build_store(workers=args.workers)}")
+
+
+if __name__ == "__main__":
+    main()
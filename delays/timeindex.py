@@ -0,0 +1,96 @@
+"""Prefix sums over time for range totals.
+
+For every (carrier, airport) series the index keeps running totals of the
+additive columns along two time axes: month of year (1-12, which the Months
+sliders select across all years) and year_month (the whole history in order).
+The total of any range is the difference of two prefix rows, so a range query
+costs one subtraction per selected series, or a single one when no carrier or
+airport is selected, no matter how many rows or months the range spans.
+"""
+import numpy as np
+import pandas as pd
+
+from delays.causes import MINUTE_COLUMNS
+from delays.lookups import CAUSE_COLUMNS
+
+ADDITIVE_COLUMNS = ["arr_flights", "arr_del15", "arr_delay", *CAUSE_COLUMNS, *MINUTE_COLUMNS]
+SERIES_KEYS = ["carrier_name", "airport_code", "airport_label"]
+AXES = ["month", "year_month"]
+
+
+class TimeIndex:
+    """Per-series prefix sums of additive columns by month and by year_month.
+
+    Besides columns, every index counts rows; missing values add nothing,
+    as in a pandas sum.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list = ADDITIVE_COLUMNS, keys: list = SERIES_KEYS):
+        self.columns = ["rows", *columns]
+        values = np.column_stack([np.ones(len(df)), np.nan_to_num(df[columns].to_numpy(np.float64))])
+
+        series_codes, series = pd.factorize(pd.MultiIndex.from_frame(df[keys]))
+        self.n_series = len(series)
+        self.codes = {}
+        self.lookup = {}
+        for level, key in enumerate(keys):
+            codes, uniques = pd.factorize(series.get_level_values(level))
+            self.codes[key] = codes
+            self.lookup[key] = {value: code for code, value in enumerate(uniques.tolist())}
+
+        self.labels = {}
+        self.prefix = {}
+        self.overall = {}
+        for axis in AXES:
+            bucket_codes, labels = pd.factorize(df[axis], sort=True)
+            self.labels[axis] = np.asarray(labels.tolist())
+            self.prefix[axis] = self._prefix(series_codes, bucket_codes, len(labels), values)
+            self.overall[axis] = self.prefix[axis].sum(axis=1)
+
+    def _prefix(self, series_codes: np.ndarray, bucket_codes: np.ndarray, n_buckets: int,
+                values: np.ndarray) -> np.ndarray:
+        """(bucket + 1, series, column) running totals; row 0 is all zeros."""
+        flat = (bucket_codes + 1) * self.n_series + series_codes
+        size = (n_buckets + 1) * self.n_series
+        sums = np.column_stack([np.bincount(flat, weights=col, minlength=size) for col in values.T])
+        sums = sums.reshape(n_buckets + 1, self.n_series, len(self.columns))
+        return np.cumsum(sums, axis=0)
+
+    def mask(self, **criteria) -> np.ndarray | None:
+        """Series matching every criterion, or None when nothing is filtered."""
+        mask = None
+        for key, values in criteria.items():
+            if values is None:
+                continue
+            if isinstance(values, str) or not np.iterable(values):
+                values = [values]
+            if len(values) == 0:
+                continue
+            lookup = self.lookup[key]
+            allowed = np.zeros(len(lookup), dtype=bool)
+            allowed[[lookup[v] for v in values if v in lookup]] = True
+            matches = allowed[self.codes[key]]
+            mask = matches if mask is None else mask & matches
+        return mask
+
+    def bounds(self, axis: str, start=None, end=None) -> tuple:
+        """Prefix rows of the inclusive range start..end; None leaves that side open."""
+        labels = self.labels[axis]
+        lo = 0 if start is None else int(np.searchsorted(labels, start, side="left"))
+        hi = len(labels) if end is None else int(np.searchsorted(labels, end, side="right"))
+        return lo, max(lo, hi)
+
+    def totals(self, axis: str = "month", start=None, end=None, **criteria) -> pd.Series:
+        """Rows and every column summed over the range and the selected series.
+
+        start and end are month numbers for axis="month" and year_month values
+        (e.g. "2019-06-01") for axis="year_month".
+        """
+        lo, hi = self.bounds(axis, start, end)
+        mask = self.mask(**criteria)
+        if mask is None:
+            sums = self.overall[axis][hi] - self.overall[axis][lo]
+        else:
+            prefix = self.prefix[axis]
+            sums = mask.astype(np.float64) @ (prefix[hi] - prefix[lo])
+        return pd.Series(sums, index=self.columns)
@@ -0,0 +1,76 @@
+"""Derived columns shared by the data store, the apps and update_data.ipynb.
+
+One definition for every derived metric:
+
+- ``date``: first day of the month, ``datetime64[ns]``.
+- ``delay_rate``: share of arriving flights delayed 15+ minutes, as a fraction
+  (0.25 means 25%). Undefined (NaN) when a row has no arriving flights.
+- ``avg_delay_min``: arrival delay minutes per arriving flight, NaN likewise.
+- ``season``: meteorological season of ``month`` as a categorical.
+
+:func:`add_airport_label` adds the ``"City (CODE)"`` filter label, also as a
+categorical, so widgets compare integer codes instead of concatenated strings.
+"""
+import numpy as np
+import pandas as pd
+
+SEASONS = ["Winter", "Spring", "Summer", "Fall"]
+
+# Every column added by add_derived_columns and add_airport_label
+DERIVED_COLUMNS = ["date", "delay_rate", "avg_delay_min", "season", "airport_label"]
+
+# SEASON_CODES[month] is the index into SEASONS; slot 0 is unused.
+SEASON_CODES = np.array([-1, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+SEASON_MONTHS = {
+    season: [m for m in range(1, 13) if SEASON_CODES[m] == i]
+    for i, season in enumerate(SEASONS)
+}
+
+
+def month_start(year: pd.Series, month: pd.Series) -> np.ndarray:
+    """Building first-of-month dates with integer arithmetic instead of string parsing."""
+    months = (year.to_numpy(np.int64) - 1970) * 12 + month.to_numpy(np.int64) - 1
+    return months.astype("datetime64[M]").astype("datetime64[ns]")
+
+
+def per_flight(numerator: pd.Series, flights: pd.Series) -> np.ndarray:
+    """Dividing by arriving flights, leaving NaN where there were none."""
+    flights = flights.to_numpy()
+    out = np.full(len(flights), np.nan, dtype=np.result_type(numerator.dtype, flights.dtype))
+    np.divide(numerator.to_numpy(), flights, out=out, where=flights > 0)
+    return out
+
+
+def season_of(month: pd.Series) -> pd.Categorical:
+    """Mapping months to seasons through a lookup table of category codes."""
+    return pd.Categorical.from_codes(SEASON_CODES[month.to_numpy()], categories=SEASONS)
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Adding date, delay_rate, avg_delay_min and season in place and returning df."""
+    df["date"] = month_start(df["year"], df["month"])
+    df["delay_rate"] = per_flight(df["arr_del15"], df["arr_flights"])
+    df["avg_delay_min"] = per_flight(df["arr_delay"], df["arr_flights"])
+    df["season"] = season_of(df["month"])
+    return df
+
+
+def airport_label(city: pd.Series, airport_code: pd.Series) -> pd.Categorical:
+    """Building "City (CODE)" once per airport and sharing it through category codes."""
+    codes, airports = pd.factorize(airport_code)
+    seen, first = np.unique(codes, return_index=True)
+    cities = city.to_numpy()[first[seen >= 0]]
+    labels = np.array([f"{c} ({a})" for c, a in zip(cities, airports)], dtype=object)
+
+    order = np.argsort(labels)
+    rank = np.empty(len(order) + 1, dtype=np.intp)
+    rank[order] = np.arange(len(order))
+    rank[-1] = -1
+    return pd.Categorical.from_codes(rank[codes], categories=labels[order])
+
+
+def add_airport_label(df: pd.DataFrame) -> pd.DataFrame:
+    """Adding the airport_label filter column in place and returning df."""
+    df["airport_label"] = airport_label(df["city"], df["airport_code"])
+    return df
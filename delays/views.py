@@ -0,0 +1,43 @@
+"""Per-tab views over the one canonical table of the store.
+
+Every tab works on a subset of the same rows: the reduced airports and
+carriers, or the 2014-2019 window of the Delay Causes tab. Instead of
+loading a frame per tab, a view keeps its subset as row positions and a
+column list over the shared table. The frame is only built when first asked
+for; with copy-on-write (enabled by the apps) its columns and contiguous rows
+are views of the table rather than copies.
+"""
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+
+class View:
+    """Row positions and columns of one tab over the canonical table."""
+
+    def __init__(self, table: pd.DataFrame, mask: np.ndarray | None = None,
+                 columns: list | None = None):
+        self.table = table
+        self.rows = None if mask is None else np.flatnonzero(mask)
+        self.columns = list(table.columns) if columns is None else list(columns)
+
+    def __len__(self) -> int:
+        return len(self.table) if self.rows is None else len(self.rows)
+
+    @cached_property
+    def frame(self) -> pd.DataFrame:
+        """The view's rows and columns as a read-only frame, built once.
+
+        The shared row table is laid out so the tabs' rows are contiguous (see
+        delays.shared), which makes their frames slices of it; other masks
+        gather their rows into a copy.
+        """
+        table = self.table[self.columns]
+        rows = self.rows
+        if rows is None:
+            return table
+        if len(rows) == 0 or rows[-1] - rows[0] + 1 == len(rows):
+            start = rows[0] if len(rows) else 0
+            return table.iloc[start:start + len(rows)].reset_index(drop=True)
+        return table.take(rows).reset_index(drop=True)
@@ -1,10 +1,10 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
 
-from data import load_data
-from filters import render_filters, apply_filters
-from charts import plot_airport_delay_bar
-from layouts import header_metrics, body_layout_tabs
+# filters, charts and layouts import from this folder; delays/ from the repository root above it
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 
 # -----------------------------
@@ -25,9 +25,23 @@ def main() -> None:
     st.title("Airline Delay Causes Dashboard")
     st.caption("Airline Delay app for Filter & Fly")
 
+    # Deferred until the title is on screen: pandas, the query layer and the local modules that use them
+    import pandas as pd
+    from filters import render_filters, apply_filters, query_filters
+    from charts import plot_airport_delay_bar
+    from layouts import header_metrics, body_layout_tabs
+    from delays import queries
+    from delays.grid import paged_dataframe
+
+    # apply_filters slices the airport frame every session shares; copy-on-write keeps the slices views.
+    pd.set_option("mode.copy_on_write", True)
+
     # ✅ Data loading (cached)
     #df = load_data("data/sample.csv")
-    df = load_data('../csv/delays_reduced.csv')
+    # The reduced airports and carriers of the store, with the index and presorted delays built
+    # once per store version by the query layer
+    data = queries.dataset()
+    df = data.airport_view.frame
 
 
     # -------------------------
@@ -37,7 +51,11 @@ def main() -> None:
     selections = render_filters(df)
 
     # apply_filters returns a filtered dataframe based on selections
-    df_f = apply_filters(df, selections)
+    df_f = apply_filters(df, selections, data.airport_index, data.airport_quantiles)
+
+    # Medians merged from presorted groups. Capped delays can move an airport's median, so with
+    # capping on the chart takes its medians from the capped rows instead.
+    medians = None if selections["cap_outliers"] else queries.airport_medians(**query_filters(selections))
 
     # -------------------------
     # Header metrics
@@ -57,16 +75,17 @@ def main() -> None:
     )
 
     if tab_choice == "Tabs":
-        body_layout_tabs(df_f)
+        body_layout_tabs(df_f, medians)
     else:
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("Median Delay Minutes by Airport")
-            plot_airport_delay_bar(df_f)
+            plot_airport_delay_bar(df_f, medians)
 
         with col2:
             st.subheader("Filtered Rows")
-            st.dataframe(df_f, width='stretch', height=420)
+            columns = [c for c in df_f.columns if c != "airport_label"]
+            paged_dataframe(df_f, columns=columns, key="rows", width='stretch', height=420)
 
 
 if __name__ == "__main__":
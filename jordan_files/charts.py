@@ -1,21 +1,26 @@
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
 
-def plot_airport_delay_bar(df: pd.DataFrame) -> None:
-    """Plotting median delay by airport."""
+def plot_airport_delay_bar(df: pd.DataFrame, medians: pd.Series | None = None) -> None:
+    """Plotting median delay by airport, from precomputed medians when given."""
     if df.empty:
         st.info("No rows match your filters.")
         return
     x_val = 'airport_code'
     y_val = 'arr_delay'
-    df_agg = (
-        df.groupby([x_val], as_index=False)[y_val]
-        .median()
-        #.to_frame()
-        #.reset_index()
-    )
+    if medians is not None:
+        df_agg = medians.rename(y_val).reset_index()
+    else:
+        df_agg = (
+            df.groupby([x_val], as_index=False, observed=True)[y_val]
+            .median()
+            #.to_frame()
+            #.reset_index()
+        )
+    # plotly is imported by the first chart rather than at startup
+    import plotly.express as px
+
     fig = px.bar(
         df_agg,
         x=x_val,
@@ -30,6 +35,8 @@ def plot_response_hist(df: pd.DataFrame) -> None:
         st.info("No rows match your filters.")
         return
 
+    import plotly.express as px
+
     fig = px.histogram(
         df,
         x="response_time_days",
@@ -52,6 +59,8 @@ def plot_borough_bar(df: pd.DataFrame) -> None:
         .sort_values("median_response_days", ascending=False)
     )
 
+    import plotly.express as px
+
     fig = px.bar(
         agg,
         x="borough",
@@ -1,14 +1,20 @@
 import pandas as pd
 import streamlit as st
 
+from delays.index import FilterIndex
+from delays.quantiles import QuantileStore
+from delays.queries import airport_criteria
+
+CAP_QUANTILE = 0.99
+
 
 def render_filters(df: pd.DataFrame) -> dict:
     """Rendering filter widgets and returning the chosen values."""
     st.sidebar.header("Filters")
 
-    airport_name = df['city'] + " (" + df['airport_code'] + ")"
-    airline_list = ["All"] + sorted(df["carrier_name"].unique().tolist())
-    airport_list = ["All"] + sorted(airport_name.unique().tolist())
+    # Observed values only: the shared frame's categories also list carriers and airports it doesn't hold
+    airline_list = ["All"] + sorted(df["carrier_name"].dropna().unique().tolist())
+    airport_list = ["All"] + sorted(df["airport_label"].dropna().unique().tolist())
     #complaint_types = sorted(df["complaint_type"].unique().tolist())
 
     airline = st.sidebar.selectbox("Airline", airline_list, index=0)
@@ -26,8 +32,7 @@ def render_filters(df: pd.DataFrame) -> dict:
         step=1,
     )
 
-    # TODO (IN-CLASS): Add a checkbox toggle to cap outliers (e.g., at 99th percentile)
-    cap_outliers = st.sidebar.checkbox("Cap extreme response times", value=False)
+    cap_outliers = st.sidebar.checkbox("Cap extreme delays (99th percentile)", value=False)
 
     return {
         "airline": airline,
@@ -38,22 +43,42 @@ def render_filters(df: pd.DataFrame) -> dict:
     }
 
 
-def apply_filters(df: pd.DataFrame, selections: dict) -> pd.DataFrame:
-    """Applying filter selections to the dataframe."""
-    out = df.copy()
+def query_filters(selections: dict) -> dict:
+    """Turning filter selections into delays.queries airport filters."""
+    return {
+        "carrier": None if selections["airline"] == "All" else selections["airline"],
+        "airport": None if selections["airport"] == "All" else selections["airport"],
+        "months": tuple(selections["rt_range"]),
+    }
+
+
+def filter_criteria(selections: dict) -> dict:
+    """Turning filter selections into FilterIndex/QuantileStore criteria."""
+    return airport_criteria(**query_filters(selections))
+
+
+def apply_filters(df: pd.DataFrame, selections: dict, index: FilterIndex | None = None,
+                  quantiles: QuantileStore | None = None) -> pd.DataFrame:
+    """Applying filter selections to the dataframe.
 
-    if selections["airline"] != "All":
-        airline = 'carrier_name'
-        out = out[out[airline] == selections["airline"]]
+    Only the matching rows are gathered; with no effective filter the input
+    frame itself is returned, so callers must treat the result as read-only.
+    With cap_outliers, arr_delay is clipped at the selection's 99th percentile.
+    """
+    if index is None:
+        index = FilterIndex(df)
 
-    if selections["airport"] != "All":
-        airport_name = out['city'] + " (" + out['airport_code'] + ")"
-        out = out[airport_name == selections["airport"]]
+    criteria = filter_criteria(selections)
+    out = FilterIndex.take(df, index.select(**criteria))
+
+    if selections["cap_outliers"]:
+        if quantiles is None:
+            cap = out["arr_delay"].quantile(CAP_QUANTILE)
+        else:
+            cap = quantiles.quantile(CAP_QUANTILE, **criteria)
+        out = out.assign(arr_delay=out["arr_delay"].clip(upper=cap))
 
    # if selections["complaint"] != "All":
         #out = out[out["complaint_type"] == selections["complaint"]]
 
-    lo, hi = selections["rt_range"]
-    out = out[(out["month"] >= lo) & (out["month"] <= hi)]
-
     return out.reset_index(drop=True)
@@ -23,13 +23,13 @@ def header_metrics(df: pd.DataFrame) -> None:
         st.metric("Most Common Delay", "TODO")
 
 
-def body_layout_tabs(df: pd.DataFrame) -> None:
+def body_layout_tabs(df: pd.DataFrame, medians: pd.Series | None = None) -> None:
     """Tabs layout with 3 default tabs."""
     t1, t2, t3 = st.tabs(["By Airport", "To Do", "To Do"])
 
     with t1:
         st.subheader("Median Delay Minutes by Airport")
-        plot_airport_delay_bar(df)
+        plot_airport_delay_bar(df, medians)
 
 
     with t2:
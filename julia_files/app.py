@@ -1,6 +1,10 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+# delays/ sits one level up from julia_files/, which is all Streamlit puts on the path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 # ---------------------------------
 # Page Config
@@ -20,27 +24,11 @@ st.divider()
 # ---------------------------------
 # Load Data
 # ---------------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv("../csv/delays_updated.csv")
-
-    # Create date column if year/month exist
-    if "year" in df.columns and "month" in df.columns:
-        df["date"] = pd.to_datetime(
-            df["year"].astype(str) + "-" + df["month"].astype(str) + "-01"
-        )
-
-    # Create delay_rate if not already created
-    if "delay_rate" not in df.columns:
-        df["delay_rate"] = df.apply(
-            lambda x: x["arr_del15"] / x["arr_flights"]
-            if x["arr_flights"] > 0 else 0,
-            axis=1
-        )
+# The title and caption above paint while the query layer and its pandas/pyarrow import
+from delays import queries
 
-    return df
-
-df = load_data()
+# Trends and KPIs come from the query layer's pre-aggregated cube, built once per store version
+cube = queries.dataset().trend_cube
 
 # ---------------------------------
 # Filters
@@ -50,11 +38,11 @@ st.subheader("Filters")
 c1, c2, c3 = st.columns(3)
 
 with c1:
-    seasons = ["All"] + sorted(df["season"].dropna().unique())
+    seasons = ["All"] + sorted(cube.seasons)
     selected_season = st.selectbox("Season", seasons)
 
 with c2:
-    carriers = sorted(df["carrier_name"].dropna().unique())
+    carriers = sorted(cube.carriers)
     selected_carriers = st.multiselect(
         "Carrier Name",
         carriers,
@@ -62,7 +50,7 @@ with c2:
     )
 
 with c3:
-    airports = sorted(df["airport_code"].dropna().unique())
+    airports = sorted(cube.airports)
     selected_airports = st.multiselect(
         "Airport",
         airports,
@@ -74,24 +62,20 @@ st.divider()
 # ---------------------------------
 # Apply Filters
 # ---------------------------------
-df_f = df.copy()
-
-if selected_season != "All":
-    df_f = df_f[df_f["season"] == selected_season]
-
-if selected_carriers:
-    df_f = df_f[df_f["carrier_name"].isin(selected_carriers)]
-
-if selected_airports:
-    df_f = df_f[df_f["airport_code"].isin(selected_airports)]
+filters = dict(
+    season=None if selected_season == "All" else selected_season,
+    carriers=selected_carriers,
+    airports=selected_airports,
+)
 
 # ---------------------------------
 # KPI Section
 # ---------------------------------
 k1, k2 = st.columns(2)
 
-avg_delay = df_f["avg_delay_min"].mean() if not df_f.empty else 0
-avg_rate = df_f["delay_rate"].mean() if not df_f.empty else 0
+kpis = queries.trend_kpis(**filters)
+avg_delay = kpis["avg_delay_min"]
+avg_rate = kpis["delay_rate"]
 
 with k1:
     st.metric("Average Delay (minutes)", f"{avg_delay:.2f}")
@@ -104,28 +88,20 @@ st.divider()
 # ---------------------------------
 # SMART GROUPING LOGIC
 # ---------------------------------
-group_var = None
-
-if len(selected_carriers) > 1:
-    group_var = "carrier_name"
-elif len(selected_airports) > 1:
-    group_var = "airport_code"
+group_var = queries.trend_group(selected_carriers, selected_airports)
 
 # ---------------------------------
 # AVG DELAY TREND
 # ---------------------------------
+import plotly.express as px
+
 st.subheader("Trend of Average Delay Minutes")
 
-if not df_f.empty:
+df_trend = queries.trends("avg_delay_min", by=group_var, **filters)
 
-    if group_var:
-        df_trend = (
-            df_f.groupby(["date", group_var])["avg_delay_min"]
-            .mean()
-            .reset_index()
-            .sort_values("date")
-        )
+if not df_trend.empty:
 
+    if group_var:
         fig = px.line(
             df_trend,
             x="date",
@@ -135,13 +111,6 @@ if not df_f.empty:
         )
 
     else:
-        df_trend = (
-            df_f.groupby("date")["avg_delay_min"]
-            .mean()
-            .reset_index()
-            .sort_values("date")
-        )
-
         fig = px.line(
             df_trend,
             x="date",
@@ -167,16 +136,11 @@ st.divider()
 # ---------------------------------
 st.subheader("Trend of Delay Rate")
 
-if not df_f.empty:
+df_trend_rate = queries.trends("delay_rate", by=group_var, **filters)
 
-    if group_var:
-        df_trend_rate = (
-            df_f.groupby(["date", group_var])["delay_rate"]
-            .mean()
-            .reset_index()
-            .sort_values("date")
-        )
+if not df_trend_rate.empty:
 
+    if group_var:
         fig2 = px.line(
             df_trend_rate,
             x="date",
@@ -186,13 +150,6 @@ if not df_f.empty:
         )
 
     else:
-        df_trend_rate = (
-            df_f.groupby("date")["delay_rate"]
-            .mean()
-            .reset_index()
-            .sort_values("date")
-        )
-
         fig2 = px.line(
             df_trend_rate,
             x="date",
@@ -1,60 +1,35 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import scipy.stats as stats
+import sys
+from pathlib import Path
+
 import streamlit as st
 
-df = pd.read_csv('../csv/delays_transformed.csv')
-df = df[(df['year'] <= 2019) & (df['year'] >= 2014)]
+# Streamlit only adds nessa_files/ to the path; the delays package is in its parent
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-# Different way of de
-airport_risk = df.groupby("airport_name_cleansed", as_index=False).agg(
-    total_flights=("arr_flights", "sum"),
-    total_delays=("arr_del15", "sum")
-)
-airport_risk = airport_risk[airport_risk['total_flights'] >= 100000]
-airport_risk['delay_pct'] = airport_risk['total_delays'] / airport_risk['total_flights']
-top10_airports = airport_risk.sort_values('delay_pct', ascending=False).head(10)['airport_name_cleansed'].tolist()
+st.title("Historical Delay Causes (2014-2019)")
 
-airport = st.selectbox("Select Airport", index=None, placeholder="Any Airport", options=top10_airports)
-if airport is not None:
-    airline = st.selectbox("Select Airline", index=None, placeholder="Any Airline", options=sorted(df[df['airport_name_cleansed'] == airport]['carrier_name'].unique()))
-else:
-    airline = st.selectbox("Select Airline", index=None, placeholder="Any Airline", options=df['carrier_name'].unique())
-season = st.selectbox("Select Season", index=None, placeholder="All Year", options=['Winter (Dec-Feb)', 'Spring (Mar-May)', 'Summer (June-Aug)', 'Fall (Sept-Nov)'])
+# After the title, so it shows while pandas and pyarrow load behind the queries
+from delays import queries
 
-pie_df = df.copy()
+# The ranking, airline lists and cause shares (2014-2019) are memoized per version of the data store
+top10_airports = list(queries.risky_airports())
 
-if airport is not None:
-    pie_df = pie_df[pie_df["airport_name_cleansed"].str.contains(airport, case=False, na=False)]
-if airline is not None:
-    pie_df = pie_df[pie_df["carrier_name"].str.contains(airline, case=False, na=False)]
-if season is not None:
-    if 'Winter' in season:
-        pie_df = pie_df[pie_df["month"].isin([12, 1, 2])]
-    elif 'Spring' in season:
-        pie_df = pie_df[pie_df["month"].isin([3, 4, 5])]
-    elif 'Summer' in season:
-        pie_df = pie_df[pie_df["month"].isin([6, 7, 8])]
-    elif 'Fall' in season:
-        pie_df = pie_df[pie_df["month"].isin([9, 10, 11])]
-
-pie_df = (pie_df.groupby("carrier_name", as_index=False)[["arr_flights", 'arr_del15', 'carrier_ct', 'weather_ct', 'nas_ct', 'security_ct', 'late_aircraft_ct']].sum())
-pie_df.insert(1, 'on_time', pie_df['arr_flights'] - pie_df['arr_del15'])
+airport = st.selectbox("Select Airport", index=None, placeholder="Any Airport", options=top10_airports)
+airline = st.selectbox("Select Airline", index=None, placeholder="Any Airline", options=queries.cause_carriers(airport))
+season = st.selectbox("Select Season", index=None, placeholder="All Year", options=['Winter (Dec-Feb)', 'Spring (Mar-May)', 'Summer (June-Aug)', 'Fall (Sept-Nov)'])
 
-total_flights = pie_df["arr_flights"].sum()
+# Exact matches on the selected names; season labels start with the season name
+breakdown = queries.cause_breakdown(airport, airline, season.split()[0] if season else None)
+if breakdown.empty:
+    st.warning("No flights match the selection.")
+    st.stop()
 
-carrier_pct = pie_df["carrier_ct"].sum() / total_flights
-weather_pct = pie_df["weather_ct"].sum() / total_flights
-nas_pct = pie_df["nas_ct"].sum() / total_flights
-security_pct = pie_df["security_ct"].sum() / total_flights
-late_aircraft_pct = pie_df["late_aircraft_ct"].sum() / total_flights
-on_time_pct = pie_df["on_time"].sum() / total_flights
+# Each cause's delayed flights per arriving flight
+labels = breakdown.index.tolist()
+values = breakdown["count_share"].tolist()
 
-labels = ["Carrier", "Weather", "NAS", "Security", "Late Aircraft"]
-values = [carrier_pct, weather_pct, nas_pct, security_pct, late_aircraft_pct]
+# matplotlib is only imported once there is a pie to draw
+import matplotlib.pyplot as plt
 
 fig, ax = plt.subplots(figsize=(6,6))
 ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=90, colors=["red", "green", "blue", "yellow", "magenta"])
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from delays import store
+from delays.transforms import add_airport_label, add_derived_columns
+
+CATEGORICAL_COLUMNS = ["carrier_name", "airport_code", "airport_name_cleansed"]
+
+
+@pytest.fixture(scope="session")
+def rows() -> pd.DataFrame:
+    """The shipped reduced CSV with the store's derived columns, some missing delays and an unused category."""
+    df = pd.read_csv(store.CSV_DIR / "delays_reduced.csv")
+    df.loc[df.index % 17 == 0, "arr_delay"] = np.nan
+    df = add_airport_label(add_derived_columns(df))
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+    df["carrier_name"] = df["carrier_name"].cat.add_categories(["Unused Air"])
+    return df
+
+
+@pytest.fixture(scope="session")
+def mask_of(rows):
+    """The boolean mask of criteria as the engines read them: None or [] leaves a column unfiltered."""
+    def mask_of(**criteria) -> np.ndarray:
+        mask = np.ones(len(rows), dtype=bool)
+        for col, values in criteria.items():
+            if values is None:
+                continue
+            if isinstance(values, str) or not np.iterable(values):
+                values = [values]
+            if len(values):
+                mask &= rows[col].isin(list(values)).to_numpy()
+        return mask
+
+    return mask_of
+
+
+@pytest.fixture
+def csv_dir(tmp_path, monkeypatch):
+    """A CSV directory holding the first three months of the shipped reduced CSV."""
+    source = pd.read_csv(store.CSV_DIR / "delays_reduced.csv")
+    months = sorted(source["year_month"].unique())[:3]
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    source[source["year_month"].isin(months)].to_csv(csv_dir / "delays_reduced.csv", index=False)
+    monkeypatch.setattr(store, "CSV_DIR", csv_dir)
+    return csv_dir
+
+
+@pytest.fixture(scope="session")
+def mixed_store(tmp_path_factory):
+    """A store with non-reduced rows before, in and after the Delay Causes window and reduced rows in and after it."""
+    df = pd.read_csv(store.CSV_DIR / "delays_reduced.csv")
+    df["reduced"] = df["carrier"] != "DL"
+    early = df[df["year"] == 2014].assign(year=2012, reduced=False)
+    early["year_month"] = early["year_month"].str.replace("2014", "2012")
+    path = tmp_path_factory.mktemp("mixed") / "store"
+    store.write_partitions(pd.concat([early, df], ignore_index=True), path)
+    return path
+
+
+@pytest.fixture
+def shared_dir(tmp_path, monkeypatch):
+    from delays import shared
+
+    monkeypatch.setattr(shared, "SHARED_DIR", tmp_path / "shm")
+    return tmp_path / "shm"
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from delays.causes import CAUSE_LABELS, MINUTE_COLUMNS, TOTAL_COLUMNS, CauseEngine
+from delays.lookups import CAUSE_COLUMNS
+
+CRITERIA = [
+    {},
+    {"carrier_name": "Delta Air Lines Inc."},
+    {"airport_name_cleansed": None, "year": [2014, 2015, 2016], "month": range(6, 9)},
+    {"carrier_name": ["JetBlue Airways", "American Airlines Inc."], "month": [12, 1, 2]},
+]
+
+
+@pytest.fixture(scope="module")
+def engine(rows):
+    return CauseEngine(rows)
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_totals_match_masked_sums(engine, rows, mask_of, criteria):
+    expected = rows.loc[mask_of(**criteria), TOTAL_COLUMNS].sum()
+    pd.testing.assert_series_equal(engine.totals(**criteria), expected.astype("float64"))
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_breakdown_shares(engine, rows, mask_of, criteria):
+    sums = rows.loc[mask_of(**criteria), TOTAL_COLUMNS].sum()
+    breakdown = engine.breakdown(**criteria)
+    assert list(breakdown.index) == CAUSE_LABELS
+    np.testing.assert_allclose(breakdown["count_share"], sums[CAUSE_COLUMNS] / sums["arr_flights"])
+    np.testing.assert_allclose(breakdown["minute_share"], sums[MINUTE_COLUMNS] / sums[MINUTE_COLUMNS].sum())
+    assert breakdown["minute_share"].sum() == pytest.approx(1)
+
+
+def test_empty_selection(engine):
+    assert engine.breakdown(carrier_name="Unused Air").empty
+    assert (engine.totals(carrier_name="Unused Air") == 0).all()
+
+
+def test_no_delay_minutes(rows):
+    engine = CauseEngine(rows.assign(**{col: 0.0 for col in MINUTE_COLUMNS}))
+    breakdown = engine.breakdown(carrier_name="Delta Air Lines Inc.")
+    assert (breakdown["minute_share"] == 0).all()
+    assert breakdown["count_share"].gt(0).any()
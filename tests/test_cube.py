@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from delays.cube import MEASURES, TrendCube
+
+SELECTIONS = [
+    (None, [], []),
+    ("Winter", [], []),
+    (None, ["Delta Air Lines Inc."], []),
+    ("Summer", ["Delta Air Lines Inc.", "JetBlue Airways"], []),
+    (None, [], ["ATL", "LAX"]),
+    ("Fall", ["American Airlines Inc."], ["ORD", "DFW"]),
+]
+
+
+@pytest.fixture(scope="module")
+def cube(rows):
+    return TrendCube.from_rows(rows)
+
+
+def _selected(rows, mask_of, season, carriers, airports):
+    return rows[mask_of(season=season, carrier_name=carriers, airport_code=airports)]
+
+
+@pytest.mark.parametrize("measure", MEASURES)
+@pytest.mark.parametrize("season, carriers, airports", SELECTIONS)
+def test_trend_matches_groupby(cube, rows, mask_of, measure, season, carriers, airports):
+    by = "carrier_name" if len(carriers) > 1 else "airport_code" if len(airports) > 1 else None
+    keys = ["date"] if by is None else ["date", by]
+    expected = _selected(rows, mask_of, season, carriers, airports).groupby(keys, observed=True)[measure].mean()
+
+    actual = cube.trend(measure, season, carriers, airports, by=by).set_index(keys)[measure]
+    assert actual.index.is_unique and actual.reset_index()["date"].is_monotonic_increasing
+    pd.testing.assert_series_equal(actual.sort_index(), expected.sort_index(), check_names=False,
+                                   check_index_type=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("season, carriers, airports", SELECTIONS)
+def test_kpis_match_means(cube, rows, mask_of, season, carriers, airports):
+    selected = _selected(rows, mask_of, season, carriers, airports)
+    kpis = cube.kpis(season, carriers, airports)
+    for measure in MEASURES:
+        assert kpis[measure] == pytest.approx(selected[measure].mean())
+
+
+@pytest.mark.parametrize("season, carriers, airports", SELECTIONS[2:])
+def test_unknown_values_are_ignored(cube, season, carriers, airports):
+    padded = ([*carriers, "Nope Air"] if carriers else [], [*airports, "NOPE"] if airports else [])
+    pd.testing.assert_frame_equal(cube.trend("delay_rate", season, *padded),
+                                  cube.trend("delay_rate", season, carriers, airports))
+    assert cube.kpis(season, *padded) == cube.kpis(season, carriers, airports)
+
+
+def test_empty_selection(cube):
+    assert cube.kpis("Winter", ["Unused Air"]) == {m: 0 for m in MEASURES}
+    assert cube.trend("delay_rate", None, ["Delta Air Lines Inc."], ["NOPE"]).empty
+    assert cube.trend("delay_rate", "Monsoon").empty
+    assert cube.trend("delay_rate", None, ["Nope Air"], ["ATL"]).empty
+
+
+def test_options_are_observed_values(cube, rows):
+    assert sorted(cube.carriers) == sorted(rows["carrier_name"].dropna().unique())
+    assert sorted(cube.airports) == sorted(rows["airport_code"].unique())
+    assert np.isin(cube.seasons, ["Winter", "Spring", "Summer", "Fall"]).all()
@@ -0,0 +1,91 @@
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from delays import diskcache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(diskcache, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_round_trip(cache_dir):
+    key = diskcache.cache_key("frame", 1)
+    frame = pd.DataFrame({"a": [1.0, 2.0]})
+    assert diskcache.load(key) == (False, None)
+    diskcache.store(key, frame)
+    hit, value = diskcache.load(key)
+    assert hit
+    pd.testing.assert_frame_equal(value, frame)
+    assert not list(cache_dir.rglob("*.tmp"))
+
+
+def test_cached_builds_once(cache_dir):
+    calls = []
+    key = diskcache.cache_key("answer")
+    for _ in range(3):
+        assert diskcache.cached(key, lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1
+
+
+def test_key_covers_parts_and_library_versions(monkeypatch):
+    key = diskcache.cache_key("trends", ("ATL",), None)
+    assert key == diskcache.cache_key("trends", ("ATL",), None)
+    assert key != diskcache.cache_key("trends", ("LAX",), None)
+    monkeypatch.setattr(diskcache, "LIBRARY_VERSIONS", ("0", "0", "0"))
+    assert diskcache.cache_key("trends", ("ATL",), None) != key
+
+
+@pytest.mark.parametrize("payload", [
+    pickle.dumps(list(range(100)))[:20],  # cut short mid-write
+    b"cno_such_module\nThing\n.",  # refers to code that cannot be imported
+    b"not a pickle",
+])
+def test_unreadable_entry_is_a_miss(cache_dir, payload):
+    key = diskcache.cache_key("broken")
+    path = diskcache._entry_path(key)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(payload)
+    assert diskcache.load(key) == (False, None)
+    assert not path.exists()
+    assert diskcache.cached(key, lambda: "rebuilt") == "rebuilt"
+    assert diskcache.load(key) == (True, "rebuilt")
+
+
+def test_evict_drops_least_recently_used(cache_dir):
+    keys = [diskcache.cache_key("entry", i) for i in range(3)]
+    for age, key in zip([300, 100, 200], keys):
+        diskcache.store(key, b"x" * 1000)
+        path = diskcache._entry_path(key)
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime - age))
+    size = diskcache._entry_path(keys[0]).stat().st_size
+
+    assert diskcache.evict(max_bytes=size) == 2 * size
+    assert [diskcache.load(key)[0] for key in keys] == [False, True, False]
+    assert diskcache.evict(max_bytes=size) == 0
+
+
+def test_entry_evicted_after_reading_is_still_a_hit(cache_dir, monkeypatch):
+    key = diskcache.cache_key("raced")
+    diskcache.store(key, [1, 2, 3])
+
+    def evicted(path, *args):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(diskcache.os, "utime", evicted)
+    assert diskcache.load(key) == (True, [1, 2, 3])
+
+
+def test_store_scans_after_a_sixteenth_of_the_cap(cache_dir, monkeypatch):
+    scans = []
+    monkeypatch.setattr(diskcache, "MAX_BYTES", 16_000)
+    monkeypatch.setattr(diskcache, "_unscanned", 0)
+    monkeypatch.setattr(diskcache, "evict", lambda: scans.append(diskcache._unscanned))
+    for i in range(4):
+        diskcache.store(diskcache.cache_key("scan", i), b"x" * 600)
+    # About 620 bytes per entry against a 1,000-byte scan interval.
+    assert scans == [0, 0]
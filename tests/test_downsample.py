@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from delays.downsample import downsample, lttb
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 100), (1000, 3), (101, 100)])
+def test_lttb_keeps_endpoints_in_order(n, n_out):
+    rng = np.random.default_rng(0)
+    x = np.arange(n, dtype=np.float64)
+    kept = lttb(x, rng.normal(size=n), n_out)
+    assert len(kept) == n_out
+    assert kept[0] == 0 and kept[-1] == n - 1
+    assert (np.diff(kept) > 0).all()
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(1000)
+    y[[137, 612]] = [50, -80]
+    kept = lttb(np.arange(1000, dtype=np.float64), y, 50)
+    assert {137, 612} <= set(kept)
+
+
+@pytest.mark.parametrize("n_out", [2, 1000, 5000])
+def test_lttb_keeps_everything_when_not_reducing(n_out):
+    np.testing.assert_array_equal(lttb(np.arange(1000.0), np.ones(1000), n_out), np.arange(1000))
+
+
+def test_downsample_caps_each_series():
+    dates = pd.date_range("2000-01-01", periods=2000, freq="D")
+    df = pd.DataFrame({
+        "date": np.tile(dates, 3),
+        "carrier": np.repeat(["A", "B", "C"], 2000),
+        "value": np.random.default_rng(0).normal(size=6000),
+    }).iloc[: 2000 * 2 + 50]
+    out = downsample(df, "date", "value", by="carrier", max_points=100)
+    assert out.groupby("carrier")["date"].size().to_dict() == {"A": 100, "B": 100, "C": 50}
+    assert out.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(out, df.loc[out.index])
+
+
+def test_downsample_leaves_small_frames_alone():
+    df = pd.DataFrame({"date": pd.date_range("2000-01-01", periods=50), "value": np.arange(50.0)})
+    assert downsample(df, "date", "value", max_points=50) is df
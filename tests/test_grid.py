@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from delays.grid import page_positions, sort_key
+
+SORT_COLUMNS = [None, "carrier_name", "airport_label", "date", "arr_delay", "year_month"]
+
+
+def expected_positions(df, selected, page, page_size, sort_by, ascending):
+    subset = df if selected is None else df.take(selected)
+    positions = np.arange(len(df)) if selected is None else selected
+    if sort_by is not None:
+        column = subset[sort_by].reset_index(drop=True)
+        # Categoricals sort by value, not by the order of their categories.
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype(object)
+        order = column.sort_values(ascending=ascending, kind="stable", na_position="last").index
+        positions = positions[order.to_numpy()]
+    return positions[page * page_size:(page + 1) * page_size]
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("sort_by", SORT_COLUMNS)
+@pytest.mark.parametrize("page", [0, 3, 1000])
+@pytest.mark.parametrize("selection", ["all", "some", "none"])
+def test_page_positions_match_sort_values(rows, selection, page, sort_by, ascending):
+    selected = {
+        "all": None,
+        "some": np.flatnonzero(rows["airport_code"].isin(["ATL", "ORD"]).to_numpy()),
+        "none": np.empty(0, dtype=np.intp),
+    }[selection]
+    actual = page_positions(rows, selected, page, 25, sort_by, ascending)
+    np.testing.assert_array_equal(actual, expected_positions(rows, selected, page, 25, sort_by, ascending))
+
+
+def test_sort_key_puts_missing_last():
+    values = pd.Series(pd.Categorical(["b", None, "a"], categories=["b", "a"]))
+    key = sort_key(values)
+    assert key[2] < key[0] and np.isnan(key[1])
+    assert np.isnan(sort_key(pd.Series(["x", None]))[1])
+    assert np.isnan(sort_key(pd.Series(pd.to_datetime(["2020-01-01", None])))[1])
+
+
+def test_paged_dataframe_renders_one_page():
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import numpy as np
+        import pandas as pd
+
+        from delays.grid import paged_dataframe
+
+        df = pd.DataFrame({"a": np.arange(120), "b": np.arange(120) % 7})
+        paged_dataframe(df, np.arange(10, 120), ["a"], key="grid", page_size=50)
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    assert at.caption[0].value == "Rows 1–50 of 110"
+    at.number_input(key="grid_page").set_value(3).run()
+    shown = at.dataframe[0].value
+    assert list(shown.columns) == ["a"] and shown["a"].tolist() == list(range(110, 120))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from delays.index import FilterIndex
+
+CRITERIA = [
+    {},
+    {"carrier_name": None, "airport_code": []},
+    {"carrier_name": "Delta Air Lines Inc."},
+    {"airport_code": ["ATL", "LAX"], "month": range(3, 7)},
+    {"carrier_name": ["JetBlue Airways"], "airport_label": "Chicago (ORD)", "season": "Winter"},
+    {"year": [2015, 2016], "month": 12},
+    {"carrier_name": "Unused Air"},
+]
+
+
+@pytest.fixture(scope="module")
+def index(rows):
+    return FilterIndex(rows)
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_select_matches_mask(index, rows, mask_of, criteria):
+    selected = index.select(**criteria)
+    expected = np.flatnonzero(mask_of(**criteria))
+    if selected is None:
+        assert len(expected) == len(rows)
+    else:
+        np.testing.assert_array_equal(selected, expected)
+        assert len(FilterIndex.take(rows, selected)) == len(expected)
+
+
+def test_rows_and_counts(index, rows):
+    values = ["ATL", "ORD", "NOPE"]
+    expected = np.flatnonzero(rows["airport_code"].isin(values))
+    np.testing.assert_array_equal(index.rows("airport_code", values), expected)
+    assert index.count("airport_code", values) == len(expected)
+
+
+def test_values_are_observed_and_sorted(index, rows):
+    assert list(index.values["carrier_name"]) == sorted(rows["carrier_name"].dropna().unique())
+    assert FilterIndex.take(rows, None) is rows
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from delays import store
+from delays.ingest import SOURCE_COLUMNS, ingest, normalize_extract
+
+
+@pytest.fixture
+def extract(csv_dir, tmp_path):
+    """A raw BTS extract for 2030-01: the first CSV month under BTS column names, plus an unknown airport."""
+    source = pd.read_csv(csv_dir / "delays_reduced.csv")
+    month = source[source["year_month"] == source["year_month"].min()].assign(year=2030, month=1)
+    extra = month.iloc[[0]].assign(airport_code="ZZZ", airport_full_name="Nowhere, NV: Nowhere Municipal")
+    raw = pd.concat([month, extra], ignore_index=True).drop(
+        columns=["year_month", "city", "state", "airport_name_cleansed"]
+    ).rename(columns={"airport_code": "airport", "airport_full_name": "airport_name"})
+    path = tmp_path / "extract.csv"
+    raw.to_csv(path, index=False)
+    return path
+
+
+def test_normalize_extract(extract):
+    df = normalize_extract(pd.read_csv(extract))
+    assert list(df.columns) == SOURCE_COLUMNS
+    assert (df["year_month"] == "2030-01-01").all()
+    last = df.iloc[-1]
+    assert (last["city"], last["state"], last["airport_name_cleansed"]) == ("Nowhere", "NV", "Nowhere Municipal")
+
+
+def test_ingest_adds_only_its_months(extract, tmp_path):
+    path = tmp_path / "store"
+    store.ensure_store(path)
+    before = store.store_manifest(path)
+
+    assert ingest([extract], path) == ["2030-01-01"]
+    after = store.store_manifest(path)
+    assert after["version"] == before["version"] + 1
+    assert {ym: p for ym, p in after["partitions"].items() if ym != "2030-01-01"} == before["partitions"]
+    assert after["partitions"]["2030-01-01"]["source"] == "ingest"
+
+    rows = store.read_store(["airport_code", "reduced", "season"], filters=[("year_month", "==", "2030-01-01")],
+                            path=path)
+    assert len(rows) == len(pd.read_csv(extract))
+    # Carriers and airports already on the reduced dashboards stay on them; new airports do not.
+    assert rows.loc[rows["airport_code"] != "ZZZ", "reduced"].all()
+    assert not rows.loc[rows["airport_code"] == "ZZZ", "reduced"].any()
+    assert (rows["season"] == "Winter").all()
+    assert not store.ensure_store(path)
@@ -0,0 +1,32 @@
+import pytest
+
+from delays.index import FilterIndex
+from delays.lookups import airport_carriers, top_risky_airports
+
+
+@pytest.fixture(scope="module")
+def causes(rows):
+    return rows[rows["year"].between(2014, 2019)].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("min_flights", [0, 10_000, 100_000])
+def test_top_risky_airports_match_groupby(causes, min_flights):
+    totals = causes.groupby("airport_name_cleansed", observed=True)[["arr_flights", "arr_del15"]].sum()
+    totals = totals[totals["arr_flights"] >= min_flights]
+    expected = (totals["arr_del15"] / totals["arr_flights"]).sort_values(ascending=False).head(10)
+    assert top_risky_airports(causes, min_flights) == tuple(expected.index)
+
+
+def test_airport_carriers(causes):
+    airport = causes["airport_name_cleansed"].iloc[0]
+    expected = sorted(causes.loc[causes["airport_name_cleansed"] == airport, "carrier_name"].unique())
+    assert airport_carriers(causes, airport) == tuple(expected)
+    index = FilterIndex(causes, ["airport_name_cleansed"])
+    assert airport_carriers(causes, airport, index) == tuple(expected)
+
+
+def test_airport_carriers_without_airport(causes):
+    # Only observed carriers, never the categorical's unused categories.
+    assert airport_carriers(causes) == tuple(sorted(causes["carrier_name"].dropna().unique()))
+    assert "Unused Air" not in airport_carriers(causes)
+    assert airport_carriers(causes, "Nowhere International") == ()
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from delays.quantiles import QuantileStore
+
+CRITERIA = [
+    {},
+    {"carrier_name": "Delta Air Lines Inc."},
+    {"airport_label": "Chicago (ORD)", "month": range(6, 9)},
+    {"carrier_name": ["JetBlue Airways", "American Airlines Inc."], "month": [1, 2, 12]},
+]
+
+
+@pytest.fixture(scope="module")
+def quantiles(rows):
+    return QuantileStore(rows)
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_median_by_matches_groupby(quantiles, rows, mask_of, criteria):
+    expected = rows[mask_of(**criteria)].groupby("airport_code", observed=True)["arr_delay"].median()
+    actual = quantiles.median(by="airport_code", **criteria)
+    pd.testing.assert_series_equal(actual.sort_index(), expected.dropna().sort_index(), check_names=False,
+                                   check_index_type=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("q", [0.0, 0.25, 0.5, 0.9, 0.99, 1.0])
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_quantile_matches_series(quantiles, rows, mask_of, criteria, q):
+    expected = rows.loc[mask_of(**criteria), "arr_delay"].quantile(q)
+    assert quantiles.quantile(q, **criteria) == pytest.approx(expected)
+
+
+def test_empty_selection(quantiles):
+    assert np.isnan(quantiles.median(carrier_name="Unused Air"))
+    assert quantiles.median(by="airport_code", carrier_name="Unused Air").empty
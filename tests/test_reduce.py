@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from delays import store
+from delays.reduce import reduce_source
+
+
+@pytest.fixture(scope="module")
+def shipped():
+    return pd.read_csv(store.CSV_DIR / "delays_reduced.csv")
+
+
+@pytest.fixture
+def source(shipped, tmp_path):
+    """A transformed source the notebook reduces to the shipped CSV.
+
+    Around the shipped rows: carrier ZZ makes DEN, EWR and SFO top-6 airports
+    in 2014 with the most delays of any carrier, a carrier sorting first only
+    flies before 2014 and a low-delay airport is never in a top 6.
+    """
+    template = shipped.iloc[[0]]
+    extra = [
+        template.assign(carrier="ZZ", carrier_name="Zed Air", airport_code=code, year=2014, arr_del15=1e6)
+        for code in ["DEN", "EWR", "SFO"]
+    ] + [
+        template.assign(carrier="0A", carrier_name="Early Air", year=2013),
+        template.assign(airport_code="XXX", arr_del15=0.0),
+    ]
+    path = tmp_path / "delays_transformed.csv"
+    pd.concat([shipped, *extra], ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("chunksize", [500, 100_000])
+def test_matches_notebook_subset(shipped, source, tmp_path, chunksize):
+    output = tmp_path / "reduced.csv"
+    result = reduce_source(source, output, chunksize)
+    assert result["carriers"] == ["9E", "AA", "AS", "B6", "DL"]
+    assert result["airports"] == sorted(shipped["airport_code"].unique())
+    assert result["rows"] == len(shipped)
+    pd.testing.assert_frame_equal(pd.read_csv(output), shipped)
+
+
+def test_rank_carriers_keeps_most_delayed(source, tmp_path):
+    result = reduce_source(source, tmp_path / "reduced.csv", rank_carriers=True)
+    assert "ZZ" in result["carriers"] and len(result["carriers"]) == 5
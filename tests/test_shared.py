@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from delays import shared
+from delays.store import manifest_version, read_manifest, read_store
+
+KEYS = ["year_month", "carrier", "airport_code"]
+
+
+@pytest.fixture
+def version(mixed_store):
+    return manifest_version(read_manifest(mixed_store))
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.astype({c: str for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    return df.sort_values(KEYS, ignore_index=True)
+
+
+def test_rows_match_the_store(mixed_store, shared_dir, version):
+    table = shared.read_shared("rows", version, path=mixed_store)
+    stored = read_store(path=mixed_store)[table.columns]
+    pd.testing.assert_frame_equal(_sorted(table), _sorted(stored), check_dtype=False)
+
+
+@pytest.mark.parametrize("columns, filters", [
+    (["year", "carrier", "arr_delay"], [("reduced", "==", True)]),
+    (None, [("year", ">=", 2014), ("year", "<=", 2019)]),
+    (["year_month", "carrier", "airport_code", "arr_flights"], [("carrier", "in", ["AA", "DL"]), ("month", ">", 6)]),
+    (["year_month", "carrier", "airport_code"], [("carrier", "==", "nope")]),
+])
+def test_projections_match_read_store(mixed_store, shared_dir, version, columns, filters):
+    actual = shared.read_shared("rows", version, columns, filters, path=mixed_store)
+    expected = read_store(columns, filters, path=mixed_store)
+    assert list(actual.columns) == list(expected.columns)
+    if "year_month" in actual.columns:
+        pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected), check_dtype=False)
+    else:
+        assert len(actual) == len(expected)
+
+
+@pytest.mark.parametrize("filters, contiguous", [
+    ([("reduced", "==", True)], True),
+    ([("year", ">=", shared.CAUSE_YEARS[0]), ("year", "<=", shared.CAUSE_YEARS[1])], True),
+    ([("month", "==", 6)], False),
+])
+def test_contiguous_filters_are_zero_copy(mixed_store, shared_dir, version, filters, contiguous):
+    shared.attach("rows", version, mixed_store)
+    before = pa.total_allocated_bytes()
+    df = shared.read_shared("rows", version, ["arr_delay", "arr_flights"], filters, path=mixed_store)
+    # Slices stay in the memory-mapped file; gathered rows are copied into Arrow memory.
+    gathered = pa.total_allocated_bytes() - before
+    assert (gathered == 0) == contiguous
+    assert len(df) and not df["arr_delay"].to_numpy().flags.writeable
+
+
+def test_layout_keeps_tab_rows_contiguous(mixed_store, shared_dir, version):
+    table = shared.read_shared("rows", version, path=mixed_store)
+    for mask in [table["reduced"], table["year"].between(*shared.CAUSE_YEARS)]:
+        rows = np.flatnonzero(mask.to_numpy())
+        assert len(rows) and rows[-1] - rows[0] + 1 == len(rows)
+    reduced = table[table["reduced"]]
+    assert reduced["year_month"].astype(str).is_monotonic_increasing
+
+
+def test_publish_replaces_only_this_stores_versions(mixed_store, shared_dir, version, tmp_path):
+    other = shared_dir / f"{shared._prefix('rows', tmp_path / 'elsewhere')}-v1-abc.arrow"
+    stale = shared.shared_path("rows", "v0-old", mixed_store)
+    shared_dir.mkdir()
+    other.write_bytes(b"another checkout's table")
+    stale.write_bytes(b"an older version")
+
+    target = shared.publish("rows", version, mixed_store)
+    assert target.exists() and other.exists() and not stale.exists()
+
+
+def test_attach_republishes_an_unlinked_table(mixed_store, shared_dir, version):
+    target = shared.publish("rows", version, mixed_store)
+    target.unlink()
+    assert shared.attach("rows", version, mixed_store).num_rows == sum(
+        p["rows"] for p in read_manifest(mixed_store)["partitions"].values())
+    assert target.exists()
@@ -0,0 +1,112 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from delays import store
+from delays.transforms import DERIVED_COLUMNS
+
+
+def _age_manifest(path, seconds=10):
+    """Backdating the manifest, as if the CSVs had changed since the build."""
+    earlier = (path / store.MANIFEST).stat().st_mtime - seconds
+    os.utime(path / store.MANIFEST, (earlier, earlier))
+
+
+def test_readers_never_build(tmp_path):
+    path = tmp_path / "store"
+    with pytest.raises(FileNotFoundError, match="python -m delays.queries"):
+        store.store_manifest(path)
+    assert not (path / store.MANIFEST).exists()
+
+
+def test_build_round_trip(csv_dir, tmp_path):
+    path = tmp_path / "store"
+    assert store.ensure_store(path)
+    source = pd.read_csv(csv_dir / "delays_reduced.csv")
+    manifest = store.store_manifest(path)
+
+    assert sorted(manifest["partitions"]) == sorted(source["year_month"].unique())
+    assert sum(p["rows"] for p in manifest["partitions"].values()) == len(source)
+    assert len(store.read_store(path=path)) == len(source)
+    assert not list(path.rglob("*.tmp"))
+
+
+def test_ensure_store_rebuilds_only_when_stale(csv_dir, tmp_path):
+    path = tmp_path / "store"
+    assert store.ensure_store(path)
+    first = store.store_manifest(path)
+    assert not store.ensure_store(path)
+    assert store.store_manifest(path) == first
+
+    (csv_dir / "delays_reduced.csv").touch()
+    _age_manifest(path)
+    assert store._is_stale(path)
+    assert store.ensure_store(path)
+    second = store.store_manifest(path)
+    assert second["version"] == first["version"] + 1
+    assert store.manifest_version(second) != store.manifest_version(first)
+    # Identical data: the content hash, and the disk caches keyed on it, survive the rebuild.
+    assert store.content_hash(second) == store.content_hash(first)
+    assert not store.ensure_store(path)
+
+
+def test_concurrent_ensure_builds_once(csv_dir, tmp_path):
+    path = tmp_path / "store"
+    with ThreadPoolExecutor(4) as pool:
+        built = list(pool.map(lambda _: store.ensure_store(path), range(4)))
+    assert sorted(built) == [False, False, False, True]
+    assert store.store_manifest(path)["version"] == 1
+
+
+def test_write_partitions_replaces_only_their_months(csv_dir, tmp_path):
+    path = tmp_path / "store"
+    store.ensure_store(path)
+    before = store.store_manifest(path)["partitions"]
+
+    source = store._read_sources()
+    month = min(before)
+    assert store.write_partitions(source[source["year_month"] == month].iloc[:5], path) == [month]
+    after = store.store_manifest(path)["partitions"]
+    assert after[month]["rows"] == 5 and after[month]["version"] != before[month]["version"]
+    assert {ym: p for ym, p in after.items() if ym != month} == {ym: p for ym, p in before.items() if ym != month}
+
+
+def test_code_changes_rederive_every_month(csv_dir, tmp_path, monkeypatch):
+    path = tmp_path / "store"
+    store.ensure_store(path)
+    source = store._read_sources()
+    month = max(store.store_manifest(path)["partitions"])
+    # An ingested month after the CSV ones, with a derived column the old code got wrong.
+    ingested = source[source["year_month"] == month].assign(year_month="2030-01-01", year=2030, month=1)
+    store.write_partitions(ingested, path)
+    monkeypatch.setattr(store, "DERIVE_VERSION", "new-code")
+
+    assert store._is_stale(path)
+    assert store.ensure_store(path)
+    partitions = store.store_manifest(path)["partitions"]
+    assert {p["derive"] for p in partitions.values()} == {"new-code"}
+    assert partitions["2030-01-01"]["source"] == "ingest"
+    assert partitions["2030-01-01"]["rows"] == len(ingested)
+
+    rederived = store.read_store(filters=[("year_month", "==", "2030-01-01")], path=path)
+    assert set(DERIVED_COLUMNS) <= set(rederived.columns)
+    assert (rederived["season"] == "Winter").all()
+    assert (rederived["date"] == pd.Timestamp("2030-01-01")).all()
+    expected = (rederived["arr_delay"] / rederived["arr_flights"]).where(rederived["arr_flights"] > 0)
+    pd.testing.assert_series_equal(rederived["avg_delay_min"], expected, check_names=False)
+    assert not store.ensure_store(path)
+
+
+def test_ingested_months_survive_csv_rebuilds(csv_dir, tmp_path):
+    path = tmp_path / "store"
+    store.ensure_store(path)
+    source = store._read_sources()
+    store.write_partitions(source.iloc[:5].assign(year_month="2030-01-01"), path)
+
+    (csv_dir / "delays_reduced.csv").touch()
+    _age_manifest(path)
+    assert store.ensure_store(path)
+    partitions = store.store_manifest(path)["partitions"]
+    assert partitions["2030-01-01"]["rows"] == 5 and len(partitions) == source["year_month"].nunique() + 1
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from delays.timeindex import ADDITIVE_COLUMNS, TimeIndex
+
+CRITERIA = [
+    {},
+    {"carrier_name": "Delta Air Lines Inc."},
+    {"airport_label": ["Chicago (ORD)", "Atlanta (ATL)"], "carrier_name": None},
+    {"airport_code": "LAX", "carrier_name": ["JetBlue Airways", "Unused Air"]},
+]
+RANGES = [
+    ("month", None, None),
+    ("month", 3, 8),
+    ("month", 12, 12),
+    ("year_month", "2015-01-01", "2018-12-01"),
+    ("year_month", "2019-06-01", None),
+    ("year_month", "2030-01-01", None),
+]
+
+
+@pytest.fixture(scope="module")
+def index(rows):
+    return TimeIndex(rows)
+
+
+@pytest.mark.parametrize("axis, start, end", RANGES)
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_totals_match_masked_sums(index, rows, mask_of, criteria, axis, start, end):
+    in_range = pd.Series(True, index=rows.index)
+    if start is not None:
+        in_range &= rows[axis] >= start
+    if end is not None:
+        in_range &= rows[axis] <= end
+    selected = rows[mask_of(**criteria) & in_range.to_numpy()]
+
+    expected = pd.concat([pd.Series({"rows": float(len(selected))}), selected[ADDITIVE_COLUMNS].sum()])
+    actual = index.totals(axis, start, end, **criteria)
+    pd.testing.assert_series_equal(actual, expected.astype("float64"))
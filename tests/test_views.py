@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from delays import shared
+from delays.queries import AIRPORT_VIEW_COLUMNS, CAUSE_VIEW_COLUMNS
+from delays.store import manifest_version, read_manifest
+from delays.views import View
+
+
+@pytest.fixture(autouse=True)
+def copy_on_write():
+    # As the apps run; without it, selecting columns copies them.
+    with pd.option_context("mode.copy_on_write", True):
+        yield
+
+
+@pytest.fixture
+def table(mixed_store, shared_dir):
+    return shared.read_shared("rows", manifest_version(read_manifest(mixed_store)), path=mixed_store)
+
+
+@pytest.mark.parametrize("mask, columns", [
+    (lambda t: t["reduced"], AIRPORT_VIEW_COLUMNS),
+    (lambda t: t["year"].between(*shared.CAUSE_YEARS), CAUSE_VIEW_COLUMNS),
+])
+def test_tab_views_are_slices_of_the_table(table, mask, columns):
+    mask = mask(table).to_numpy()
+    view = View(table, mask, columns)
+    frame = view.frame
+    assert len(view) == mask.sum()
+    pd.testing.assert_frame_equal(frame, table.loc[mask, columns].reset_index(drop=True))
+    assert np.shares_memory(frame["arr_flights"].to_numpy(), table["arr_flights"].to_numpy())
+    assert view.frame is frame
+
+
+def test_scattered_rows_are_gathered(table):
+    mask = (table["month"] == 6).to_numpy()
+    frame = View(table, mask, ["carrier_name", "arr_flights"]).frame
+    pd.testing.assert_frame_equal(frame, table.loc[mask, ["carrier_name", "arr_flights"]].reset_index(drop=True))
+    assert not np.shares_memory(frame["arr_flights"].to_numpy(), table["arr_flights"].to_numpy())
+
+
+def test_unfiltered_and_empty_views(table):
+    assert len(View(table)) == len(table)
+    pd.testing.assert_frame_equal(View(table).frame, table)
+    empty = View(table, np.zeros(len(table), dtype=bool), ["year"]).frame
+    assert empty.empty and list(empty.columns) == ["year"]